@@ -10,14 +10,26 @@ import shutil
 import uuid
 from typing import List, Optional
 
-from core.utils import unzip_vyb, find_vyp_in_dir, get_temp_dir, cleanup_dir
+from core.utils import (
+    unzip_vyb, find_vyp_in_dir, get_temp_dir, cleanup_dir, ZIP_COPY_BUFSIZE,
+)
 
 SUPPORTED_EXTENSIONS = {'.vyp', '.zip', '.vyb', '.sqlite', '.sqlite3', '.db'}
+SQLITE_MAGIC = b"SQLite format 3\x00"  # first 16 bytes of every SQLite 3 database file
+
+
+def has_sqlite_header(db_path: str) -> bool:
+    """Return True if the file starts with the SQLite 3 magic string."""
+    try:
+        with open(db_path, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
 
 
 def is_valid_sqlite(db_path: str) -> bool:
     """Return True if the file is a valid, non-empty SQLite database."""
-    if not os.path.exists(db_path):
+    if not has_sqlite_header(db_path):
         return False
     try:
         conn = sqlite3.connect(db_path)
@@ -43,8 +55,8 @@ def extract_vyp_from_vyb(vyb_path: str, temp_dirs: List[str]) -> str:
             vyp_name = vyp_files[0]
             extracted_path = os.path.join(temp_dir, os.path.basename(vyp_name))
 
-            with open(extracted_path, 'wb') as f:
-                f.write(zf.read(vyp_name))
+            with zf.open(vyp_name) as src, open(extracted_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
 
             if not is_valid_sqlite(extracted_path):
                 raise ValueError("Extracted .vyp is not a valid SQLite database")
@@ -78,11 +90,16 @@ def extract_database_file(file_path: str, temp_dirs: List[str]) -> str:
             with zipfile.ZipFile(file_path, 'r') as zf:
                 for info in zf.infolist():
                     if any(info.filename.lower().endswith(e) for e in ('.sqlite', '.db')):
-                        temp_dir = get_temp_dir(f'_zip_extract_tmp_{uuid.uuid4().hex}')
-                        temp_dirs.append(temp_dir)
-                        dest = os.path.join(temp_dir, os.path.basename(info.filename))
-                        with open(dest, 'wb') as f:
-                            f.write(zf.read(info.filename))
+                        with zf.open(info) as src:
+                            header = src.read(len(SQLITE_MAGIC))
+                            if header != SQLITE_MAGIC:
+                                continue
+                            temp_dir = get_temp_dir(f'_zip_extract_tmp_{uuid.uuid4().hex}')
+                            temp_dirs.append(temp_dir)
+                            dest = os.path.join(temp_dir, os.path.basename(info.filename))
+                            with open(dest, 'wb') as dst:
+                                dst.write(header)
+                                shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
                         if is_valid_sqlite(dest):
                             return dest
                         os.remove(dest)
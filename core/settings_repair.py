@@ -4,6 +4,7 @@ Repair the kb_settings table: drop → recreate → reinsert, deduplicating as n
 All progress reporting is done via progress_cb — never directly touches UI widgets.
 """
 import os
+import re
 import sqlite3
 import shutil
 import logging
@@ -14,6 +15,11 @@ from core.utils import get_temp_dir, unzip_vyb, zip_vyp, find_vyp_in_dir
 
 ProgressCallback = Callable[[str, int], None]
 
+_MAX_ROWID = 2**63 - 1
+# Text SQLite accepts as a number when converting it for an INTEGER column
+_NUMERIC_TEXT_RE = re.compile(
+    r"\s*[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*", re.ASCII)
+
 
 @dataclass
 class RepairSummary:
@@ -26,6 +32,80 @@ class RepairSummary:
     duplicate_keys: int
 
 
+def _as_rowid(value):
+    """value as SQLite stores it in an INTEGER PRIMARY KEY; NotImplemented if rejected."""
+    if value is None or type(value) is int:
+        return value
+    if isinstance(value, str) and _NUMERIC_TEXT_RE.fullmatch(value):
+        # Integer text converts exactly; float() would round it past 2**53
+        try:
+            value = int(value)
+        except ValueError:
+            value = float(value)
+        else:
+            if -2**63 <= value < 2**63:
+                return value
+            value = float(value)
+    if isinstance(value, float) and value.is_integer() and -2**63 < value < 2**63:
+        return int(value)
+    return NotImplemented
+
+
+def _as_text(value):
+    """value as a TEXT-affinity column stores it: numbers become SQLite's text form."""
+    if type(value) is int:
+        return str(value)
+    if type(value) is float:
+        if abs(value) == float("inf"):
+            return "Inf" if value > 0 else "-Inf"
+        mantissa, e, exponent = ("%.15g" % (value + 0.0)).partition("e")
+        if "." not in mantissa:
+            mantissa += ".0"
+        return mantissa + e + exponent
+    return value
+
+
+def _resolve_rows(settings_data) -> tuple[list, int, int]:
+    """
+    Replay rows in order against setting_id INTEGER PRIMARY KEY / setting_key UNIQUE,
+    as one-by-one INSERTs would: a repeated key updates the kept row's value, a
+    repeated or missing id takes the next rowid, an id SQLite rejects skips the row.
+    Returns (rows, updated, skipped).
+    """
+    rows: list = []
+    row_for_key: dict = {}
+    used_ids: set = set()
+    max_id = None
+    updated = skipped = 0
+    for setting_id, setting_key, setting_value in settings_data:
+        rowid = _as_rowid(setting_id)
+        if rowid is NotImplemented:
+            skipped += 1
+            logging.warning(f"Skipped row ({setting_id}, {setting_key}): datatype mismatch")
+            continue
+        key = _as_text(setting_key)
+        if key is not None and key in row_for_key:
+            index = row_for_key[key]
+            rows[index] = rows[index][:2] + (setting_value,)
+            updated += 1
+            continue
+        if rowid is None or rowid in used_ids:
+            if max_id is None:
+                rowid = 1
+            elif max_id < _MAX_ROWID:
+                rowid = max_id + 1
+            else:
+                rowid = None  # SQLite then picks an unused rowid at random
+        if rowid is not None:
+            used_ids.add(rowid)
+            if max_id is None or rowid > max_id:
+                max_id = rowid
+        if key is not None:
+            row_for_key[key] = len(rows)
+        rows.append((rowid, setting_key, setting_value))
+    return rows, updated, skipped
+
+
 def repair_settings(
     input_db: str,
     output_db: str,
@@ -40,7 +120,8 @@ def repair_settings(
         if progress_cb:
             progress_cb(msg, pct)
 
-    shutil.copy(input_db, output_db)
+    # copyfile: no permission-bit copy, and sendfile/fcopyfile do the transfer in-kernel
+    shutil.copyfile(input_db, output_db)
     conn: Optional[sqlite3.Connection] = None
     try:
         conn = sqlite3.connect(output_db)
@@ -104,42 +185,14 @@ def repair_settings(
             )
         """)
 
-        # Reinsert, handling duplicates
+        # Reinsert, with duplicates resolved up front instead of via IntegrityError
         _emit("Reinserting data…", 60)
-        inserted = updated = skipped = 0
-        for setting_id, setting_key, setting_value in settings_data:
-            try:
-                cursor.execute(
-                    "INSERT INTO kb_settings (setting_id, setting_key, setting_value) VALUES (?,?,?)",
-                    (setting_id, setting_key, setting_value),
-                )
-                inserted += 1
-            except sqlite3.IntegrityError as e:
-                err = str(e).lower()
-                if 'setting_id' in err:
-                    # Duplicate PK — let SQLite assign a new one
-                    try:
-                        cursor.execute(
-                            "INSERT INTO kb_settings (setting_key, setting_value) VALUES (?,?)",
-                            (setting_key, setting_value),
-                        )
-                        inserted += 1
-                    except sqlite3.IntegrityError:
-                        # Duplicate key as well — update
-                        cursor.execute(
-                            "UPDATE kb_settings SET setting_value=? WHERE setting_key=?",
-                            (setting_value, setting_key),
-                        )
-                        updated += 1
-                elif 'setting_key' in err:
-                    cursor.execute(
-                        "UPDATE kb_settings SET setting_value=? WHERE setting_key=?",
-                        (setting_value, setting_key),
-                    )
-                    updated += 1
-                else:
-                    skipped += 1
-                    logging.warning(f"Skipped row ({setting_id}, {setting_key}): {e}")
+        rows, updated, skipped = _resolve_rows(settings_data)
+        cursor.executemany(
+            "INSERT INTO kb_settings (setting_id, setting_key, setting_value) VALUES (?,?,?)",
+            rows,
+        )
+        inserted = len(rows)
 
         conn.commit()
 
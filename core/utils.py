@@ -11,6 +11,9 @@ import logging
 # Absolute path to the project root (one level above core/)
 _PKG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+ZIP_COPY_BUFSIZE = 1024 * 1024  # stream archive members in 1 MiB chunks
+VYB_COMPRESSLEVEL = 1           # zlib's fastest deflate level for .vyb output
+
 
 def get_temp_dir(name: str) -> str:
     """Return (and create) an absolute temp directory under the project root."""
@@ -27,14 +30,28 @@ def cleanup_dir(path: str) -> None:
 
 def unzip_vyb(vyb_file: str, extract_to: str) -> None:
     """Extract all contents of a .vyb (ZIP) archive into extract_to."""
+    root = os.path.realpath(extract_to)
     with zipfile.ZipFile(vyb_file, 'r') as zf:
-        zf.extractall(extract_to)
+        for info in zf.infolist():
+            dest = os.path.realpath(os.path.join(root, info.filename))
+            if os.path.commonpath([root, dest]) != root:
+                raise ValueError(f"Unsafe path in archive: {info.filename}")
+            if info.is_dir():
+                os.makedirs(dest, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            # extractall copies in 64 KiB pieces; large members go faster in 1 MiB reads
+            with zf.open(info) as src, open(dest, 'wb') as dst:
+                shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
 
 
 def zip_vyp(vyp_file: str, vyb_file: str) -> None:
     """Zip a single .vyp file into a .vyb archive."""
-    with zipfile.ZipFile(vyb_file, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(vyp_file, os.path.basename(vyp_file))
+    with zipfile.ZipFile(vyb_file, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=VYB_COMPRESSLEVEL, allowZip64=True) as zf, \
+            open(vyp_file, 'rb') as src, \
+            zf.open(os.path.basename(vyp_file), 'w', force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
 
 
 def find_vyp_in_dir(directory: str) -> str | None:
@@ -5,37 +5,364 @@ import zipfile
 import tempfile
 import logging
 import threading
+import time
 import shutil
+import struct
 import atexit
+import io
+import mmap
 import queue
-from typing import List, Dict, Tuple, Optional, Set
+import re
+import filecmp
+import functools
+import operator
+import zlib
+from itertools import chain, groupby, islice
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, Set, Iterator, Iterable
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, font, simpledialog
-import ttkbootstrap as ttkb
-from ttkbootstrap.constants import *
 from threading import Thread
-from ttkbootstrap.icons import Icon
+
+try:
+    # Optional: ISA-L's zlib-compatible deflate and CRC32 are SIMD-accelerated
+    from isal import isal_zlib as deflate_zlib
+except ImportError:
+    deflate_zlib = zlib
 
 # Constants for both applications
 SUPPORTED_EXTENSIONS = {'.vyp', '.zip', '.vyb', '.sqlite', '.db'}
 TEMP_DIR = tempfile.gettempdir()
-DEFAULT_EXCLUDED_TABLES = {
+DEFAULT_EXCLUDED_TABLES = frozenset({
     'sqlite_sequence', 'kb_fts_vtable', 'kb_fts_vtable_content',
     'kb_fts_vtable_segdir', 'kb_images', 'kb_item_images',
     'kb_fts_vtable_segments', 'kb_txn_message_config', 'kb_settings'
-}
-DEFAULT_IGNORED_TYPES = {"date", "datetime", "timestamp"}
+})
+DEFAULT_EXCLUDED_TABLES_TEXT = ", ".join(sorted(DEFAULT_EXCLUDED_TABLES))  # exclude-entry default
+DEFAULT_IGNORED_TYPES = frozenset({"date", "datetime", "timestamp"})
 DEFAULT_DECIMAL_PRECISION = 5
+ZIP_COPY_BUFSIZE = 1024 * 1024  # stream archive members in 1 MiB chunks
+VYB_COMPRESSLEVEL = 1           # zlib's fastest deflate level for .vyb output
+DEFLATE_BLOCK_SIZE = 1024 * 1024  # independently deflated slice of a large .vyp
+PARALLEL_DEFLATE_MIN_SIZE = 8 * DEFLATE_BLOCK_SIZE  # smaller files deflate on one thread
+MAX_DEFLATE_WORKERS = os.cpu_count() or 1
+STORE_PROBE_SIZE = 256 * 1024   # leading bytes test-compressed to choose deflate or stored
+STORE_RATIO_THRESHOLD = 0.9     # store the .vyp if the probe deflates to more than this
+SQLITE_MAGIC = b"SQLite format 3\x00"  # first 16 bytes of every SQLite 3 database file
+SQLITE_MAX_ROWID = 2**63 - 1
+SQLITE_MAX_VARIABLES = 999      # bound parameters per statement on SQLite builds before 3.32
+FETCH_BATCH_SIZE = 10000        # rows pulled per fetchmany() during data comparison
+MAX_COMPARE_WORKERS = min(8, os.cpu_count() or 1)  # tables diffed concurrently
+PROGRESS_REDRAW_INTERVAL = 0.016  # seconds between progress repaints (~60 Hz)
+STATUS_FLUSH_INTERVAL_MS = 100  # worker status lines are batched into one insert per interval
+RESULT_RENDER_CHUNK = 2000      # report lines appended to the results widget per event-loop turn
+FTS_MMAP_LIMIT = 4 * 1024 ** 3  # mmap_size ceiling for the FTS rebuild (SQLite may cap it lower)
+STATEMENT_CACHE_SIZE = 512      # compiled statements kept per connection (sqlite3 default: 128)
+RAM_SCRATCH_DIR = "/dev/shm"    # tmpfs on Linux: scratch files there never reach the disk
+RAM_SCRATCH_HEADROOM = 2        # free space RAM_SCRATCH_DIR needs, as a multiple of the scratch size
+SETTINGS_SCRATCH_PREFIX = "dbcompare_repair_"  # followed by the owning process id and "_"
+SQLITE_SORT_THREADS = min(4, os.cpu_count() or 1)  # helper threads for SQLite's external sorts
+REPORT_ARROW = "\u2192"          # separates old and new values in "Modified rows"
+NO_DIFFERENCES_MARKER = "No differences found"  # summary line of an identical-databases report
+MODIFIED_VALUE_LINE = f"      {{}}: {{}} {REPORT_ARROW} {{}}\n"  # one changed column in "Modified rows"
+
+# Write-side settings for the sanitizer's and settings repair's throwaway output copies
+SANITIZE_PRAGMAS = """
+PRAGMA synchronous = OFF;
+PRAGMA journal_mode = MEMORY;
+PRAGMA temp_store = MEMORY;
+PRAGMA locking_mode = EXCLUSIVE;
+"""
+
+# The FTS rebuild also gets a larger page cache for its joins, and sort
+# threads for building its helper indexes
+FTS_BUILD_PRAGMAS = SANITIZE_PRAGMAS + f"""PRAGMA cache_size = -262144;
+PRAGMA threads = {SQLITE_SORT_THREADS};
+"""
+
+# (index, table, column) for the FTS population query's non-primary-key joins;
+# created for the rebuild only and dropped again before commit
+FTS_JOIN_INDEXES = (
+    ("dbcompare_fts_pm_txn", "txn_payment_mapping", "txn_id"),
+    ("dbcompare_fts_li_txn", "kb_lineitems", "lineitem_txn_id"),
+    ("dbcompare_fts_sm_lineitem", "kb_serial_mapping", "serial_mapping_lineitem_id"),
+)
+
+# Statements of the settings repair. The table definition is stored verbatim in
+# sqlite_master, so its layout is kept as the repair has always written it.
+SETTINGS_TABLE_EXISTS_SQL = "SELECT name FROM sqlite_master WHERE type='table' AND name='kb_settings'"
+SETTINGS_EXPORT_SQL = "SELECT setting_id, setting_key, setting_value FROM kb_settings"
+# Row count, repeated setting_ids and repeated setting_keys (NULL keys counting
+# as one value, as in _dedupe_settings_rows), read from the table itself since
+# a damaged setting_key index may disagree with it
+SETTINGS_DUPLICATE_STATS_SQL = """SELECT COUNT(*),
+                COUNT(*) - COUNT(DISTINCT setting_id),
+                COUNT(*) - COUNT(DISTINCT setting_key) - IFNULL(MAX(setting_key IS NULL), 0)
+            FROM kb_settings NOT INDEXED"""
+SETTINGS_TABLE_DDL = """CREATE TABLE kb_settings (
+                setting_id INTEGER PRIMARY KEY,
+                setting_key TEXT UNIQUE,
+                setting_value TEXT
+            )"""
+SETTINGS_INSERT_SQL = "INSERT INTO kb_settings (setting_id, setting_key, setting_value) VALUES {}"
+SETTINGS_INSERT_ROWS = SQLITE_MAX_VARIABLES // 3  # rows per multi-row INSERT, 3 parameters each
+SETTINGS_INSERT_BATCH_SQL = SETTINGS_INSERT_SQL.format(", ".join(["(?, ?, ?)"] * SETTINGS_INSERT_ROWS))
+# PRAGMA table_info of SETTINGS_TABLE_DDL: (cid, name, type, notnull, dflt_value, pk)
+SETTINGS_TABLE_INFO = [
+    (0, 'setting_id', 'INTEGER', 0, None, 1),
+    (1, 'setting_key', 'TEXT', 0, None, 0),
+    (2, 'setting_value', 'TEXT', 0, None, 0),
+]
+
+# Foreground colours for the comparison result tags, per theme
+RESULT_TAG_COLORS = {
+    "cyborg": {  # dark
+        'version': '#5D9BFF',
+        'schema': '#B57DFF',
+        'data': '#FFA040',
+        'table': '#00E5D2',
+        'added': '#7CFC00',
+        'removed': '#FF6B6B',
+        'modified': '#FFD700',
+        'column': '#E066FF',
+        'no_diff': '#90EE90',
+        'highlight': '#FFFF00'
+    },
+    "pulse": {  # light
+        'version': '#1E56A0',
+        'schema': '#6A1B9A',
+        'data': '#E65100',
+        'table': '#00897B',
+        'added': '#2E7D32',
+        'removed': '#C62828',
+        'modified': '#F9A825',
+        'column': '#9C27B0',
+        'no_diff': '#4CAF50',
+        'highlight': '#FFFF00'
+    },
+}
+
+# Status log colours for the sanitizer, FTS and settings tabs, per theme
+STATUS_THEME_COLORS = {
+    "cyborg": {  # dark
+        "tags": {'error': '#FF6B6B', 'success': '#7CFC00', 'warning': '#FFA040'},
+        "bg": '#222222',
+        "fg": '#FFFFFF',
+    },
+    "pulse": {  # light
+        "tags": {'error': 'red', 'success': 'green', 'warning': 'orange'},
+        "bg": '#FFFFFF',
+        "fg": '#000000',
+    },
+}
+
+# Whitespace and comments ahead of an SQL statement's first keyword
+SQL_LEADING_NOISE_RE = re.compile(r"(?:\s+|--[^\n]*|/\*.*?(?:\*/|\Z))*", re.DOTALL)
+# Statements that open or end a transaction (ROLLBACK TO a savepoint does neither)
+SQL_TRANSACTION_RE = re.compile(
+    r"(?:BEGIN|COMMIT|END|ROLLBACK(?!\s+(?:TRANSACTION\s+)?TO\b))\b", re.IGNORECASE)
+
+# Text SQLite accepts as a number when converting it for an INTEGER column
+SQLITE_NUMERIC_TEXT_RE = re.compile(
+    r"\s*[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*", re.ASCII)
+
+# Read-side tuning applied to every connection used for comparison/validation.
+# journal_mode/synchronous are deliberately left alone: they would rewrite the
+# header of the user's input file, and nothing is written through these handles.
+READ_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -262144;",      # 256 MiB page cache
+    "PRAGMA mmap_size = 1073741824;",    # map up to 1 GiB instead of read() per page
+    "PRAGMA query_only = ON;",
+)
 
 # Utility functions
+def _sqlite_sort_key(value):
+    """Sort key matching SQLite's BINARY ordering: NULL < numbers < text < blobs."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, bytes(value))
+
+def _open_ro(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a SQLite connection tuned for read-heavy access."""
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _parse_table_list(text: str) -> frozenset:
+    """Parse a comma-separated table list from an entry field."""
+    return frozenset(name for name in map(str.strip, text.split(",")) if name)
+
+def _safe_ident(name: str) -> str:
+    """Quote an SQLite identifier (table or column name)."""
+    return '"' + name.replace('"', '""') + '"'
+
+def _split_sql_script(script: str) -> List[str]:
+    """Split script into statements where SQLite's tokenizer ends them.
+
+    Semicolons inside strings, comments and trigger bodies stay in their
+    statement; empty and comment-only statements are dropped.
+    """
+    statements = []
+    pending = ""
+    for piece in script.split(";"):
+        pending += piece + ";"
+        if sqlite3.complete_statement(pending):
+            statements.append(pending)
+            pending = ""
+    if pending.strip():
+        statements.append(pending[:-1])  # unterminated: let SQLite report it
+    return [stmt for stmt in statements
+            if stmt[SQL_LEADING_NOISE_RE.match(stmt).end():] not in ("", ";")]
+
+def _remove_quietly(path: str):
+    """Delete path if it still exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _build_row_differ(compared_cols: List[Tuple[int, str]]):
+    """Generate a function returning [(column, val1, val2), ...] for the given columns.
+
+    The column positions are baked into straight-line code, so comparing a row
+    pair costs one inlined != per column with no loop or tuple unpacking.
+    """
+    lines = ["def row_differences(r1, r2):", "    out = []"]
+    for n, (i, _) in enumerate(compared_cols):
+        lines.append(f"    if r1[{i}] != r2[{i}]: out.append((names[{n}], r1[{i}], r2[{i}]))")
+    lines.append("    return out")
+    namespace = {"names": tuple(name for _, name in compared_cols)}
+    exec(compile("\n".join(lines), "<row_differences>", "exec"), namespace)
+    return namespace["row_differences"]
+
+def _may_hold_real(declared_type: str) -> bool:
+    """False for columns with TEXT affinity, which store numbers as text."""
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return True
+    return not any(t in declared_type for t in ("CHAR", "CLOB", "TEXT"))
+
+def _load_clonefile():
+    """Return libc clonefile(2) on macOS, else None."""
+    if sys.platform != "darwin":
+        return None
+    try:
+        import ctypes
+        clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    return clonefile
+
+_clonefile = _load_clonefile()
+
+def _fast_copy(src: str, dst: str):
+    """Copy src to dst, letting the kernel share or copy extents where it can.
+
+    clonefile makes an APFS copy-on-write clone on macOS; copy_file_range can
+    clone extents on copy-on-write filesystems (btrfs, XFS) and otherwise
+    copies in-kernel; shutil.copyfile is the portable fallback.
+    Never a hardlink: callers modify dst and the input must stay untouched.
+    """
+    if _clonefile is not None:
+        # clonefile refuses to replace an existing destination
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+def _scratch_parent(needed_bytes: int) -> str:
+    """RAM_SCRATCH_DIR if it exists with room for needed_bytes, else TEMP_DIR."""
+    try:
+        if shutil.disk_usage(RAM_SCRATCH_DIR).free >= RAM_SCRATCH_HEADROOM * needed_bytes:
+            return RAM_SCRATCH_DIR
+    except OSError:
+        pass
+    return TEMP_DIR
+
+def _remove_stale_scratch_dirs():
+    """Delete settings repair scratch dirs in RAM_SCRATCH_DIR whose process has exited.
+
+    A killed process never runs its atexit cleanup, and tmpfs space is RAM.
+    """
+    if os.name != 'posix':
+        return
+    try:
+        names = os.listdir(RAM_SCRATCH_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(SETTINGS_SCRATCH_PREFIX):
+            continue
+        pid = name[len(SETTINGS_SCRATCH_PREFIX):].partition("_")[0]
+        if not pid.isdigit():
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(RAM_SCRATCH_DIR, name), ignore_errors=True)
+        except OSError:
+            pass  # still running under another user
+
+@functools.lru_cache(maxsize=32)
+def _scan_artifacts(temp_dir: str, mtime_ns: int, prefixes: Tuple[str, ...], ext: str) -> Tuple[str, ...]:
+    with os.scandir(temp_dir) as entries:
+        return tuple(e.name for e in entries
+                     if e.name.endswith(ext) and e.name.startswith(prefixes) and e.is_file())
+
+def _find_artifacts(temp_dir: str, prefixes: Tuple[str, ...], ext: str) -> List[str]:
+    """Names of files in temp_dir starting with one of prefixes and ending in ext.
+
+    Results are reused until the directory's mtime changes, i.e. until a file
+    is added, removed or renamed there.
+    """
+    try:
+        mtime_ns = os.stat(temp_dir).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    return list(_scan_artifacts(temp_dir, mtime_ns, prefixes, ext))
+
+def _has_sqlite_header(db_path: str) -> bool:
+    """Cheap pre-check: does the file start with the SQLite magic string?"""
+    try:
+        with open(db_path, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
 def is_valid_sqlite(db_path: str) -> bool:
     """Check if file is a valid SQLite database."""
-    if not os.path.exists(db_path):
+    # Reject non-SQLite files before paying for a connection and schema parse
+    if not _has_sqlite_header(db_path):
         return False
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _open_ro(db_path)
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         tables = cursor.fetchall()
@@ -57,8 +384,8 @@ def extract_vyp_from_vyb(vyb_path: str, temp_dirs: List[str]) -> Optional[str]:
             vyp_file = vyp_files[0]
             extracted_path = os.path.join(temp_dir, os.path.basename(vyp_file))
             
-            with open(extracted_path, 'wb') as f:
-                f.write(zip_ref.read(vyp_file))
+            with zip_ref.open(vyp_file) as src, open(extracted_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
             
             if not is_valid_sqlite(extracted_path):
                 raise ValueError("Extracted file is not a valid SQLite database")
@@ -69,13 +396,289 @@ def extract_vyp_from_vyb(vyb_path: str, temp_dirs: List[str]) -> Optional[str]:
     except Exception as e:
         raise ValueError(f"Extraction error: {str(e)}")
 
+def _deflate_block(block: bytes, last: bool) -> bytes:
+    """Raw-deflate one block so that consecutive outputs form a single stream.
+
+    Non-final blocks end with a sync flush (byte-aligned, BFINAL clear) and
+    never refer back into a previous block, so blocks compress independently.
+    """
+    compressor = deflate_zlib.compressobj(
+        VYB_COMPRESSLEVEL, deflate_zlib.DEFLATED, -deflate_zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(
+        deflate_zlib.Z_FINISH if last else deflate_zlib.Z_SYNC_FLUSH)
+
+def _write_zip_trailer(out, zinfo: zipfile.ZipInfo):
+    """Write the central directory and end records for a zip holding only zinfo at offset 0."""
+    start_dir = out.tell()
+    dt = zinfo.date_time
+    dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+    dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+    file_size, compress_size, extra = zinfo.file_size, zinfo.compress_size, b""
+    if file_size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT:
+        extra = struct.pack("<HHQQ", 1, 16, file_size, compress_size)
+        file_size = compress_size = 0xFFFFFFFF
+    try:
+        filename, flag_bits = zinfo.filename.encode("ascii"), zinfo.flag_bits
+    except UnicodeEncodeError:
+        filename, flag_bits = zinfo.filename.encode("utf-8"), zinfo.flag_bits | 0x800
+    out.write(struct.pack(
+        "<4s4B4HL2L5H2L", b"PK\x01\x02", zinfo.create_version, zinfo.create_system,
+        zinfo.extract_version, zinfo.reserved, flag_bits, zinfo.compress_type,
+        dostime, dosdate, zinfo.CRC, compress_size, file_size,
+        len(filename), len(extra), 0, 0, zinfo.internal_attr, zinfo.external_attr, 0))
+    out.write(filename)
+    out.write(extra)
+    end_dir = out.tell()
+    dir_size = end_dir - start_dir
+    if start_dir > zipfile.ZIP64_LIMIT:
+        out.write(struct.pack("<4sQ2H2L4Q", b"PK\x06\x06", 44, 45, 45, 0, 0, 1, 1,
+                              dir_size, start_dir))
+        out.write(struct.pack("<4sLQL", b"PK\x06\x07", 0, end_dir, 1))
+        start_dir = 0xFFFFFFFF
+    out.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, 1, 1, dir_size, start_dir, 0))
+
+def _pack_vyp_parallel(vyp_path: str, vyb_path: str, workers: int):
+    """pack_vyp_into_vyb for large files: deflate DEFLATE_BLOCK_SIZE slices concurrently.
+
+    zlib releases the GIL while compressing, so the blocks deflate on separate
+    cores; they are written back in order as one deflate member.
+    """
+    zinfo = zipfile.ZipInfo.from_file(vyp_path, os.path.basename(vyp_path))
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = zinfo.compress_size = 0  # placeholders for the first header
+    size = zinfo.file_size
+    crc = 0
+    pending = deque()
+    with open(vyp_path, 'rb') as src, open(vyb_path, 'wb') as out, \
+            ThreadPoolExecutor(workers, "vyb-deflate") as pool:
+        # Sizes and CRC are unknown until the end; the header is rewritten then
+        header_len = out.write(zinfo.FileHeader(zip64=True))
+        read = 0
+        while read < size:
+            block = src.read(DEFLATE_BLOCK_SIZE)
+            if not block:
+                raise OSError(f"{vyp_path} shrank while it was being archived")
+            read += len(block)
+            crc = deflate_zlib.crc32(block, crc)
+            pending.append(pool.submit(_deflate_block, block, read >= size))
+            if len(pending) >= 2 * workers:  # bound the blocks held in memory
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
+        zinfo.CRC = crc
+        zinfo.compress_size = out.tell() - header_len
+        out.seek(0)
+        out.write(zinfo.FileHeader(zip64=True))
+        out.seek(header_len + zinfo.compress_size)
+        _write_zip_trailer(out, zinfo)
+
+def _vyp_is_incompressible(vyp_path: str) -> bool:
+    """Does the start of vyp_path barely shrink under the fastest deflate level?"""
+    with open(vyp_path, 'rb') as f:
+        sample = f.read(STORE_PROBE_SIZE)
+    if not sample:
+        return False
+    return len(deflate_zlib.compress(sample, VYB_COMPRESSLEVEL)) > STORE_RATIO_THRESHOLD * len(sample)
+
+def _pack_vyp_stored(vyp_path: str, vyb_path: str):
+    """pack_vyp_into_vyb without compression; only the CRC32 is computed.
+
+    The CRC goes through deflate_zlib, so ISA-L's SIMD CRC32 is used when
+    installed (zip requires CRC32, not the CRC32C of SSE4.2).
+    """
+    zinfo = zipfile.ZipInfo.from_file(vyp_path, os.path.basename(vyp_path))
+    zinfo.compress_type = zipfile.ZIP_STORED
+    zinfo.CRC = zinfo.compress_size = 0  # placeholders for the first header
+    crc = 0
+    with open(vyp_path, 'rb') as src, open(vyb_path, 'wb') as out:
+        # The CRC is unknown until the end; the header is rewritten then
+        header_len = out.write(zinfo.FileHeader(zip64=True))
+        while True:
+            block = src.read(ZIP_COPY_BUFSIZE)
+            if not block:
+                break
+            crc = deflate_zlib.crc32(block, crc)
+            out.write(block)
+        zinfo.CRC = crc
+        zinfo.file_size = zinfo.compress_size = out.tell() - header_len
+        out.seek(0)
+        out.write(zinfo.FileHeader(zip64=True))
+        out.seek(header_len + zinfo.compress_size)
+        _write_zip_trailer(out, zinfo)
+
+def pack_vyp_into_vyb(vyp_path: str, vyb_path: str):
+    """Write vyp_path as the single member of a .vyb (ZIP) archive.
+
+    Databases whose first STORE_PROBE_SIZE bytes do not deflate usefully are
+    stored uncompressed rather than spending CPU on deflate.
+    """
+    if _vyp_is_incompressible(vyp_path):
+        _pack_vyp_stored(vyp_path, vyb_path)
+        return
+    if MAX_DEFLATE_WORKERS > 1 and os.path.getsize(vyp_path) >= PARALLEL_DEFLATE_MIN_SIZE:
+        _pack_vyp_parallel(vyp_path, vyb_path, MAX_DEFLATE_WORKERS)
+        return
+    with zipfile.ZipFile(vyb_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=VYB_COMPRESSLEVEL, allowZip64=True) as zip_ref, \
+            open(vyp_path, 'rb') as src, \
+            zip_ref.open(os.path.basename(vyp_path), 'w', force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
+
+def unpack_vyp_from_vyb(vyb_path: str, extract_to: str) -> str:
+    """Extract only the .vyp member of a .vyb archive into extract_to and return its path."""
+    with zipfile.ZipFile(vyb_path, 'r') as zip_ref:
+        name = next((n for n in zip_ref.namelist() if n.lower().endswith('.vyp')), None)
+        if name is None:
+            raise ValueError("No .vyp file found in the extracted .vyb archive.")
+        # basename() keeps archive paths such as "../x.vyp" inside extract_to
+        target = os.path.join(extract_to, os.path.basename(name))
+        with zip_ref.open(name) as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
+    return target
+
+def _as_rowid(value):
+    """value as SQLite would store it in an INTEGER PRIMARY KEY column.
+
+    None stays None (SQLite assigns the next rowid); values SQLite rejects
+    with "datatype mismatch" come back as NotImplemented.
+    """
+    if value is None or type(value) is int:
+        return value
+    if isinstance(value, str) and SQLITE_NUMERIC_TEXT_RE.fullmatch(value):
+        # Integer text converts exactly; float() would round it past 2**53
+        try:
+            value = int(value)
+        except ValueError:
+            value = float(value)
+        else:
+            if -2**63 <= value < 2**63:
+                return value
+            value = float(value)
+    if isinstance(value, float) and value.is_integer() and -2**63 < value < 2**63:
+        return int(value)
+    return NotImplemented
+
+def _as_text(value):
+    """value as a TEXT-affinity column stores it: numbers become SQLite's text form."""
+    if type(value) is int:
+        return str(value)
+    if type(value) is float:
+        if abs(value) == float("inf"):
+            return "Inf" if value > 0 else "-Inf"
+        mantissa, e, exponent = ("%.15g" % (value + 0.0)).partition("e")
+        if "." not in mantissa:
+            mantissa += ".0"
+        return mantissa + e + exponent
+    return value
+
+def _dedupe_settings_rows(settings_data):
+    """Resolve kb_settings rows the way inserting them one by one would.
+
+    Rows are replayed in order against setting_id INTEGER PRIMARY KEY and
+    setting_key UNIQUE: a repeated key updates the earlier row's value, a
+    repeated or missing id gets the next rowid, and an id SQLite cannot store
+    skips the row. Returns (rows, duplicates, updated_count, skipped_count),
+    where duplicates counts repeated raw values as {'id': n, 'key': n}.
+    """
+    rows = []
+    row_for_key = {}
+    used_ids = set()
+    max_id = None
+    updated = skipped = 0
+    seen_ids = set()
+    seen_keys = set()
+    for setting_id, setting_key, setting_value in settings_data:
+        seen_ids.add(setting_id)
+        seen_keys.add(setting_key)
+        setting_id = _as_rowid(setting_id)
+        if setting_id is NotImplemented:
+            skipped += 1
+            continue
+        key = _as_text(setting_key)
+        if key is not None and key in row_for_key:
+            index = row_for_key[key]
+            rows[index] = rows[index][:2] + (setting_value,)
+            updated += 1
+            continue
+        if setting_id is None or setting_id in used_ids:
+            if max_id is None:
+                setting_id = 1
+            elif max_id < SQLITE_MAX_ROWID:
+                setting_id = max_id + 1
+            else:
+                setting_id = None  # SQLite then picks an unused rowid at random
+        if setting_id is not None:
+            used_ids.add(setting_id)
+            if max_id is None or setting_id > max_id:
+                max_id = setting_id
+        if key is not None:
+            row_for_key[key] = len(rows)
+        rows.append((setting_id, setting_key, setting_value))
+    duplicates = {'id': len(settings_data) - len(seen_ids),
+                  'key': len(settings_data) - len(seen_keys)}
+    return rows, duplicates, updated, skipped
+
+def _settings_table_is_canonical(cursor) -> bool:
+    """Is kb_settings already laid out as SETTINGS_TABLE_DDL, with setting_key unique?
+
+    The unique index must compare keys as the repair does (BINARY collation),
+    so that rows the repair sees as distinct also fit the index.
+    """
+    info = [(cid, name, (col_type or '').upper(), notnull, default, pk)
+            for cid, name, col_type, notnull, default, pk
+            in cursor.execute("PRAGMA table_info(kb_settings)")]
+    if info != SETTINGS_TABLE_INFO:
+        return False
+    for _, name, unique, _, partial in cursor.execute("PRAGMA index_list(kb_settings)").fetchall():
+        if unique and not partial:
+            columns = [(row[2], row[4]) for row
+                       in cursor.execute(f"PRAGMA index_xinfo({_safe_ident(name)})") if row[5]]
+            if columns == [('setting_key', 'BINARY')]:
+                return True
+    return False
+
 #-------------Home Page-----------------
 class HomeTab(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
+        import ttkbootstrap as ttkb  # deferred: only the GUI needs it
         self.style = ttkb.Style()
         self.create_widgets()
     
+    def _style_color(self, name: str, fallback: str) -> str:
+        try:
+            return self.style.colors.get(name)
+        except Exception:
+            return fallback
+
+    def _feature_panel(self, parent, row: int, column: int, title: str, title_color: str,
+                       body: str, bg: str, frame_style: str, padding: int = 15):
+        """One of the four feature cards: a coloured title over a read-only text box."""
+        panel = ttk.Frame(parent, padding=padding, style=frame_style)
+        panel.grid(row=row, column=column, padx=5, pady=5, sticky="nsew")
+
+        ttk.Label(
+            panel,
+            text=title,
+            font=('Helvetica', 18, 'bold'),
+            foreground=title_color,
+            anchor=tk.CENTER
+        ).pack(fill=tk.X, pady=(0, 5))
+
+        text = tk.Text(
+            panel,
+            wrap=tk.WORD,
+            font=('Segoe UI', 11),
+            bg=bg,
+            padx=5,
+            pady=5,
+            height=5,
+            relief=tk.FLAT
+        )
+        text.insert(tk.END, body)
+        text.configure(state='disabled')
+        text.pack(fill=tk.BOTH, expand=True)
+
     def create_widgets(self):
         # Main container frame with padding
         main_frame = ttk.Frame(self, padding=(20, 10))
@@ -108,148 +711,47 @@ class HomeTab(ttk.Frame):
         features_frame = ttk.Frame(main_frame)
         features_frame.pack(fill=tk.BOTH, expand=True)
 
-        # === Left Top Panel - Comparison Tool ===
-        left_top_panel = ttk.Frame(features_frame, padding=10, style='info.TFrame')
-        left_top_panel.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
-
-        ttk.Label(
-            left_top_panel,
-            text="Database Comparison",
-            font=('Helvetica', 18, 'bold'),
-            foreground="#006400",  # Dark Green
-            anchor=tk.CENTER
-        ).pack(fill=tk.X, pady=(0, 5))
-
-        feature_text1 = """
+        self._feature_panel(
+            features_frame, 0, 0, "Database Comparison", "#006400",  # Dark Green
+            """
         • Compare two Vyapar database files
         • Analyze schema differences
         • Detect data inconsistencies
         • Support for multiple formats: [.vyp, .vyb]
-        """
-
-        try:
-            info_bg = self.style.colors.get('info')
-        except Exception:
-            info_bg = '#E6F3FF'
-
-        text1 = tk.Text(
-            left_top_panel,
-            wrap=tk.WORD,
-            font=('Segoe UI', 11),
-            bg=info_bg,
-            padx=5,
-            pady=5,
-            height=5,
-            relief=tk.FLAT
+        """,
+            bg=self._style_color('info', '#E6F3FF'), frame_style='info.TFrame', padding=10
         )
-        text1.insert(tk.END, feature_text1)
-        text1.configure(state='disabled')
-        text1.pack(fill=tk.BOTH, expand=True)
-
-        # === Right Top Panel - Sanitization Tool ===
-        right_top_panel = ttk.Frame(features_frame, padding=15, style='success.TFrame')
-        right_top_panel.grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
-
-        ttk.Label(
-            right_top_panel,
-            text="Database Sanitization",
-            font=('Helvetica', 18, 'bold'),
-            foreground="#8B0000",  # Dark Red
-            anchor=tk.CENTER
-        ).pack(fill=tk.X, pady=(0, 5))
-
-        feature_text2 = """
+        self._feature_panel(
+            features_frame, 0, 1, "Database Sanitization", "#8B0000",  # Dark Red
+            """
         • Remove sensitive information
         • Convert between .vyp and .vyb
         • Built-in sanitization templates:
         • Clear contact details
         • Reset catalog settings
-        """
-
-        try:
-            success_bg = self.style.colors.get('success')
-        except Exception:
-            success_bg = '#E6FFE6'
-
-        text2 = tk.Text(
-            right_top_panel,
-            wrap=tk.WORD,
-            font=('Segoe UI', 11),
-            bg=success_bg,
-            padx=5,
-            pady=5,
-            height=5,
-            relief=tk.FLAT
+        """,
+            bg=self._style_color('success', '#E6FFE6'), frame_style='success.TFrame'
         )
-        text2.insert(tk.END, feature_text2)
-        text2.configure(state='disabled')
-        text2.pack(fill=tk.BOTH, expand=True)
-
-        # === Left Bottom Panel - FTS Tool ===
-        left_bottom_panel = ttk.Frame(features_frame, padding=15, style='warning.TFrame')
-        left_bottom_panel.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
-
-        ttk.Label(
-            left_bottom_panel,
-            text="FTS Table Generator",
-            font=('Helvetica', 18, 'bold'),
-            foreground="#DAA520",  # Goldenrod
-            anchor=tk.CENTER
-        ).pack(fill=tk.X, pady=(0, 5))
-
-        feature_text3 = """
+        self._feature_panel(
+            features_frame, 1, 0, "FTS Table Generator", "#DAA520",  # Goldenrod
+            """
         • Generate Full Text Search (FTS) tables
         • Supports FTS3 
         • Indexes multiple business-related fields
         • Easy one-click generation
-        """
-
-        text3 = tk.Text(
-            left_bottom_panel,
-            wrap=tk.WORD,
-            font=('Segoe UI', 11),
-            bg='#FFF9E6',
-            padx=5,
-            pady=5,
-            height=5,
-            relief=tk.FLAT
+        """,
+            bg='#FFF9E6', frame_style='warning.TFrame'
         )
-        text3.insert(tk.END, feature_text3)
-        text3.configure(state='disabled')
-        text3.pack(fill=tk.BOTH, expand=True)
-
-        # === Right Bottom Panel - Settings Generator ===
-        right_bottom_panel = ttk.Frame(features_frame, padding=15, style='secondary.TFrame')
-        right_bottom_panel.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
-
-        ttk.Label(
-            right_bottom_panel,
-            text="Settings Table Generator",
-            font=('Helvetica', 18, 'bold'),
-            foreground="#4B0082",  # Indigo
-            anchor=tk.CENTER
-        ).pack(fill=tk.X, pady=(0, 5))
-
-        feature_text4 = """
+        self._feature_panel(
+            features_frame, 1, 1, "Settings Table Generator", "#4B0082",  # Indigo
+            """
         • Auto-generate settings entries
         • Customize Vyapar behavior via keys
         • Use as a boilerplate generator
         • Detect and fix common issues in one click
-        """
-
-        text4 = tk.Text(
-            right_bottom_panel,
-            wrap=tk.WORD,
-            font=('Segoe UI', 11),
-            bg='#F0F0FF',
-            padx=5,
-            pady=5,
-            height=5,
-            relief=tk.FLAT
+        """,
+            bg='#F0F0FF', frame_style='secondary.TFrame'
         )
-        text4.insert(tk.END, feature_text4)
-        text4.configure(state='disabled')
-        text4.pack(fill=tk.BOTH, expand=True)
 
         # Make grid responsive
         features_frame.columnconfigure(0, weight=1)
@@ -312,10 +814,22 @@ class DatabaseComparator:
         self.validate_db = True
         self.temp_dirs = []
         self.visual_diff_data = []
+        # (id(conn), table) -> column info; reset whenever connections change
+        self._colinfo_cache: Dict[Tuple[int, str], List[Dict]] = {}
+        # Per-thread connections used by the parallel data comparison
+        self._worker_local = threading.local()
+        self._worker_conns: List[sqlite3.Connection] = []
+        self._worker_lock = threading.Lock()
 
     def set_progress_callback(self, callback):
         self.progress_callback = callback
 
+    def reset(self):
+        """Drop per-comparison state so the same instance can be reused."""
+        self.cleanup_temp_files()
+        self.visual_diff_data = []
+        self._colinfo_cache.clear()
+
     def update_progress(self, message: str, percent: int = None):
         if self.progress_callback:
             self.progress_callback(message, percent)
@@ -334,11 +848,17 @@ class DatabaseComparator:
                 with zipfile.ZipFile(file_path, 'r') as zip_ref:
                     for file_info in zip_ref.infolist():
                         if any(file_info.filename.lower().endswith(ext) for ext in ['.sqlite', '.db']):
-                            temp_dir = tempfile.mkdtemp()
-                            self.temp_dirs.append(temp_dir)
-                            extracted_path = os.path.join(temp_dir, os.path.basename(file_info.filename))
-                            with open(extracted_path, 'wb') as f:
-                                f.write(zip_ref.read(file_info.filename))
+                            with zip_ref.open(file_info) as src:
+                                # Peek at the header so non-SQLite members are never inflated
+                                header = src.read(len(SQLITE_MAGIC))
+                                if header != SQLITE_MAGIC:
+                                    continue
+                                temp_dir = tempfile.mkdtemp()
+                                self.temp_dirs.append(temp_dir)
+                                extracted_path = os.path.join(temp_dir, os.path.basename(file_info.filename))
+                                with open(extracted_path, 'wb') as dst:
+                                    dst.write(header)
+                                    shutil.copyfileobj(src, dst, ZIP_COPY_BUFSIZE)
                             if is_valid_sqlite(extracted_path):
                                 return extracted_path
                             os.remove(extracted_path)
@@ -354,18 +874,20 @@ class DatabaseComparator:
             
         conn = None
         try:
-            conn = sqlite3.connect(db_path)
+            conn = _open_ro(db_path)
             cursor = conn.cursor()
             
-            cursor.execute("PRAGMA integrity_check;")
+            # quick_check covers the structural checks of integrity_check without
+            # cross-checking every index entry; stop at the first problem found
+            cursor.execute("PRAGMA quick_check(1);")
             integrity_result = cursor.fetchone()
             if integrity_result[0] != "ok":
                 error_msg = f"Integrity check failed for {db_path}: {integrity_result}"
                 logging.error(error_msg)
                 return False
             
-            cursor.execute("PRAGMA foreign_key_check;")
-            if cursor.fetchall():
+            cursor.execute("SELECT 1 FROM pragma_foreign_key_check LIMIT 1;")
+            if cursor.fetchone():
                 error_msg = f"Foreign key violations in {db_path}"
                 logging.error(error_msg)
                 return False
@@ -381,17 +903,25 @@ class DatabaseComparator:
     def connect_databases(self, db1_path: str, db2_path: str):
         try:
             self.cleanup_temp_files()
+            self._colinfo_cache.clear()
             
-            self.db1_path = self.extract_database_file(db1_path)
-            if self.validate_db and not self.validate_database(self.db1_path):
-                raise ValueError(f"Validation failed for first database: {self.db1_path}")
-            self.db1_conn = sqlite3.connect(self.db1_path)
-            self.db1_conn.execute("PRAGMA foreign_keys = ON;")
+            # Inflating an archive and the validation pragmas both run in C with
+            # the GIL released, so each input is prepared on its own thread and
+            # one database's checks overlap the other's extraction
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dbcmp-extract") as executor:
+                db1_future = executor.submit(self._prepare_database, db1_path)
+                db2_future = executor.submit(self._prepare_database, db2_path)
+                self.db1_path, db1_valid = db1_future.result()
+                self.db2_path, db2_valid = db2_future.result()
             
-            self.db2_path = self.extract_database_file(db2_path)
-            if self.validate_db and not self.validate_database(self.db2_path):
+            if not db1_valid:
+                raise ValueError(f"Validation failed for first database: {self.db1_path}")
+            if not db2_valid:
                 raise ValueError(f"Validation failed for second database: {self.db2_path}")
-            self.db2_conn = sqlite3.connect(self.db2_path)
+            
+            self.db1_conn = _open_ro(self.db1_path)
+            self.db1_conn.execute("PRAGMA foreign_keys = ON;")
+            self.db2_conn = _open_ro(self.db2_path)
             self.db2_conn.execute("PRAGMA foreign_keys = ON;")
         except Exception as e:
             if hasattr(self, 'db1_conn') and self.db1_conn:
@@ -400,6 +930,11 @@ class DatabaseComparator:
                 self.db2_conn.close()
             raise
 
+    def _prepare_database(self, file_path: str) -> Tuple[str, bool]:
+        """Extract one input and validate it. Returns (database path, passed validation)."""
+        db_path = self.extract_database_file(file_path)
+        return db_path, self.validate_database(db_path)
+
     def cleanup_temp_files(self):
         for temp_dir in self.temp_dirs:
             try:
@@ -422,13 +957,46 @@ class DatabaseComparator:
         return table_names
 
     def get_column_info(self, conn: sqlite3.Connection, table_name: str) -> List[Dict]:
+        key = (id(conn), table_name)
+        columns = self._colinfo_cache.get(key)
+        if columns is None:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT cid, name, type, "notnull", dflt_value, pk FROM pragma_table_info(?);',
+                (table_name,)
+            )
+            columns = [
+                {'cid': row[0], 'name': row[1], 'type': row[2], 
+                 'notnull': row[3], 'dflt_value': row[4], 'pk': row[5]}
+                for row in cursor.fetchall()
+            ]
+            self._colinfo_cache[key] = columns
+        return columns
+
+    def _prefetch_column_info(self, conn: sqlite3.Connection):
+        """Load column info for every table of conn in a single query."""
         cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({table_name});")
-        return [
-            {'cid': row[0], 'name': row[1], 'type': row[2], 
-             'notnull': row[3], 'dflt_value': row[4], 'pk': row[5]}
-            for row in cursor.fetchall()
-        ]
+        try:
+            cursor.execute(
+                'SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk '
+                "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+                "WHERE m.type = 'table' ORDER BY m.name, p.cid;"
+            )
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            # e.g. a virtual table whose module isn't available; get_column_info
+            # falls back to per-table lookups
+            logging.warning(f"Column info prefetch failed: {str(e)}")
+            return
+        schema = defaultdict(list)
+        for table, *info in rows:
+            schema[table].append(
+                {'cid': info[0], 'name': info[1], 'type': info[2],
+                 'notnull': info[3], 'dflt_value': info[4], 'pk': info[5]}
+            )
+        conn_id = id(conn)
+        for table, columns in schema.items():
+            self._colinfo_cache[(conn_id, table)] = columns
 
     def compare_databases(self, db1_path: str, db2_path: str, 
                          included_tables: Set[str] = None, 
@@ -436,41 +1004,76 @@ class DatabaseComparator:
                          ignore_datetime: bool = True,
                          decimal_precision: int = DEFAULT_DECIMAL_PRECISION,
                          validate_db: bool = True) -> str:
+        report = io.StringIO()
+        self._write_comparison(report, db1_path, db2_path, included_tables, excluded_tables,
+                               ignore_datetime, decimal_precision, validate_db)
+        return report.getvalue()
+
+    def compare_databases_to_file(self, db1_path: str, db2_path: str,
+                                  included_tables: Set[str] = None,
+                                  excluded_tables: Set[str] = None,
+                                  ignore_datetime: bool = True,
+                                  decimal_precision: int = DEFAULT_DECIMAL_PRECISION,
+                                  validate_db: bool = True, *,
+                                  out_path: str) -> bool:
+        """Like compare_databases, but write the report to out_path (UTF-8) as it is produced.
+
+        Returns True if the databases differ, False if out_path holds the
+        "no differences" summary.
+        """
+        with open(out_path, 'w', encoding='utf-8', newline='\n') as out:
+            return self._write_comparison(out, db1_path, db2_path, included_tables, excluded_tables,
+                                          ignore_datetime, decimal_precision, validate_db)
+
+    def _write_comparison(self, out, db1_path, db2_path, included_tables, excluded_tables,
+                          ignore_datetime, decimal_precision, validate_db) -> bool:
+        """Write the report to the text stream out, section by section; True if anything differs."""
         try:
+            self.visual_diff_data = []
             self.validate_db = validate_db
             self.included_tables = included_tables or set()
             self.excluded_tables = excluded_tables or set()
-            self.ignored_data_types = DEFAULT_IGNORED_TYPES if ignore_datetime else set()
+            self.ignored_data_types = DEFAULT_IGNORED_TYPES if ignore_datetime else frozenset()
             self.decimal_precision = decimal_precision
             
             self.connect_databases(db1_path, db2_path)
+            self._prefetch_column_info(self.db1_conn)
+            self._prefetch_column_info(self.db2_conn)
             
             db1_tables = set(self.get_table_list(self.db1_conn))
             db2_tables = set(self.get_table_list(self.db2_conn))
             
+            common_included = None
             if self.included_tables:
                 try:
                     valid_db1_tables = self.validate_table_names(self.db1_conn, self.included_tables)
                     valid_db2_tables = self.validate_table_names(self.db2_conn, self.included_tables)
                     common_included = valid_db1_tables & valid_db2_tables
-                    db1_tables = db1_tables.intersection(common_included)
-                    db2_tables = db2_tables.intersection(common_included)
                 except ValueError as e:
                     raise ValueError(f"Table validation error: {str(e)}")
             
-            db1_tables = db1_tables.difference(self.excluded_tables)
-            db2_tables = db2_tables.difference(self.excluded_tables)
+            # Apply the include and exclude filters in one pass per database
+            excluded = frozenset(self.excluded_tables)
+            db1_tables = {t for t in db1_tables
+                          if t not in excluded and (common_included is None or t in common_included)}
+            db2_tables = {t for t in db2_tables
+                          if t not in excluded and (common_included is None or t in common_included)}
             
             version_diff = self._compare_versions()
+            out.write(version_diff + "\n")
             schema_diff = self._compare_schemas(db1_tables, db2_tables)
-            data_diff = self._compare_data(db1_tables.intersection(db2_tables))
-            
-            if not any(("differ" in version_diff, 
-                       "differences" in schema_diff.lower(),
-                       "differences" in data_diff.lower())):
-                return "=== Comparison Results ===\n\nNo differences found between the databases\n\nCompared:\n- Database versions\n- Schema (tables and columns)\n- Data (all rows and values)"
+            out.write(schema_diff + "\n")
+            differs = "differ" in version_diff or "differences" in schema_diff.lower()
+            # Data sections can be large: each is written out as soon as it is ready
+            for chunk in self._iter_data_diff(db1_tables.intersection(db2_tables)):
+                out.write(chunk)
+                differs = differs or "differences" in chunk.lower()
             
-            return version_diff + "\n" + schema_diff + "\n" + data_diff
+            if not differs:
+                out.seek(0)
+                out.truncate()
+                out.write(f"=== Comparison Results ===\n\n{NO_DIFFERENCES_MARKER} between the databases\n\nCompared:\n- Database versions\n- Schema (tables and columns)\n- Data (all rows and values)")
+            return differs
         except Exception as e:
             logging.error(f"Error comparing databases: {str(e)}", exc_info=True)
             raise
@@ -479,6 +1082,7 @@ class DatabaseComparator:
                 self.db1_conn.close()
             if hasattr(self, 'db2_conn') and self.db2_conn:
                 self.db2_conn.close()
+            self._colinfo_cache.clear()
             self.cleanup_temp_files()
 
     def _compare_versions(self) -> str:
@@ -502,16 +1106,17 @@ class DatabaseComparator:
     def _compare_schemas(self, db1_tables: Set[str], db2_tables: Set[str]) -> str:
         self.update_progress("Comparing schemas...", 10)
         
-        diff_report = ["=== Schema Differences ===\n"]
+        diff_report = io.StringIO()
+        diff_report.write("=== Schema Differences ===\n")
         added_tables = db2_tables - db1_tables
         removed_tables = db1_tables - db2_tables
         common_tables = db1_tables.intersection(db2_tables)
         
         if added_tables:
-            diff_report.append(f"New Tables added in DB2 {sorted(added_tables)}\n\n")
+            diff_report.write(f"New Tables added in DB2 {sorted(added_tables)}\n\n")
         
         if removed_tables:
-            diff_report.append(f"Tables removed in DB2 {sorted(removed_tables)}\n\n")
+            diff_report.write(f"Tables removed in DB2 {sorted(removed_tables)}\n\n")
         
         schema_differences_found = False
         for i, table in enumerate(sorted(common_tables)):
@@ -528,18 +1133,18 @@ class DatabaseComparator:
             
             if cols_only_in_db1 or cols_only_in_db2:
                 schema_differences_found = True
-                diff_report.append(f"*Table: {table}*\n")
+                diff_report.write(f"*Table: {table}*\n")
                 if cols_only_in_db1:
-                    diff_report.append(f"  Columns only in DB1: {', '.join(sorted(cols_only_in_db1))}\n")
+                    diff_report.write(f"  Columns only in DB1: {', '.join(sorted(cols_only_in_db1))}\n")
                 if cols_only_in_db2:
-                    diff_report.append(f"  Columns only in DB2: {', '.join(sorted(cols_only_in_db2))}\n")
-                diff_report.append("\n")
+                    diff_report.write(f"  Columns only in DB2: {', '.join(sorted(cols_only_in_db2))}\n")
+                diff_report.write("\n")
         
         if not (added_tables or removed_tables or schema_differences_found):
-            diff_report.append("No schema differences found\n")
+            diff_report.write("No schema differences found\n")
         
         self.update_progress("Schema comparison complete", 80)
-        return "".join(diff_report)
+        return diff_report.getvalue()
 
     def _round_if_float(self, value):
         if isinstance(value, float):
@@ -549,135 +1154,237 @@ class DatabaseComparator:
                 return value
         return value
 
-    def _values_equal(self, val1, val2):
-        if val1 == val2:
-            return True
-        
-        if isinstance(val1, (int, float)) and isinstance(val2, (int, float)):
-            return self._round_if_float(val1) == self._round_if_float(val2)
-        
-        return False
+    def _iter_data_diff(self, common_tables: Set[str]) -> Iterator[str]:
+        """Yield the data differences section piece by piece, tables in sorted order.
 
-    def _compare_data(self, common_tables: Set[str]) -> str:
+        Each table's report is yielded as soon as it and every table before it
+        are done, so finished reports are not all held until the end.
+        """
         self.update_progress("Comparing data...", 80)
-        diff_report = ["=== Data Differences ===\n"]
+        yield "=== Data Differences ===\n"
         data_differences_found = False
         
-        for i, table in enumerate(sorted(common_tables)):
-            self.update_progress(f"Comparing data in table: {table}", 80 + int(20 * i / len(common_tables)))
-            
-            db1_cols = self.get_column_info(self.db1_conn, table)
-            db2_cols = self.get_column_info(self.db2_conn, table)
-            
-            if len(db1_cols) != len(db2_cols):
-                diff_report.append(f"*Table: {table}* has different column structures - skipping data comparison\n\n")
-                continue
-            
-            pk_cols = [col['name'] for col in db1_cols if col['pk']] or [col['name'] for col in db1_cols]
-            col_names = [col['name'] for col in db1_cols]
-            order_by = ", ".join(pk_cols)
-            
-            db1_data = self._fetch_all_data(self.db1_conn, table, col_names, order_by)
-            db2_data = self._fetch_all_data(self.db2_conn, table, col_names, order_by)
-            
-            pk_indices = [col_names.index(col) for col in pk_cols]
-            def get_pk(row): 
-                # Handle None values in primary keys by converting them to empty strings
-                pk_tuple = tuple('' if val is None else val for val in (row[i] for i in pk_indices))
-                return pk_tuple if len(pk_tuple) > 1 else pk_tuple[0]
-                
-            db1_map = {get_pk(row): row for row in db1_data}
-            db2_map = {get_pk(row): row for row in db2_data}
-            
-            rows_only_in_db1 = []
-            rows_only_in_db2 = []
-            modified_rows = []
-            
-            # Get all primary keys and sort them safely
-            all_pks = set(db1_map.keys()).union(set(db2_map.keys()))
-            try:
-                sorted_pks = sorted(all_pks)
-            except TypeError:
-                # Fallback to string representation if sorting fails
-                sorted_pks = sorted(all_pks, key=lambda x: str(x))
-            
-            for pk in sorted_pks:
-                if pk in db1_map and pk not in db2_map:
-                    rows_only_in_db1.append(pk)
-                elif pk not in db1_map and pk in db2_map:
-                    rows_only_in_db2.append(pk)
-                else:
-                    row1 = db1_map[pk]
-                    row2 = db2_map[pk]
-                    
-                    differences = []
-                    for i, (val1, val2) in enumerate(zip(row1, row2)):
-                        col_name = col_names[i]
-                        col_type = db1_cols[i]['type'].lower()
-                        
-                        if any(ignored in col_type for ignored in self.ignored_data_types):
-                            continue
-                            
-                        if not self._values_equal(val1, val2):
-                            differences.append((col_name, val1, val2))
-                    
-                    if differences:
-                        modified_rows.append((pk, differences))
-                        # Store for visual viewer
-                        diff_entry = {
-                            "table": table,
-                            "pk": dict(zip(pk_cols, pk)) if isinstance(pk, tuple) else {pk_cols[0]: pk},
-                            "columns": [
-                                {"name": col_name, "db1": val1, "db2": val2}
-                                for col_name, val1, val2 in differences
-                            ]
-                        }
-                        self.visual_diff_data.append(diff_entry)
-                                
-            if rows_only_in_db1 or rows_only_in_db2 or modified_rows:
-                data_differences_found = True
-                diff_report.append(f"*Table: {table}*\n")
-                
-                if rows_only_in_db1:
-                    diff_report.append(f"  Rows only in DB1 (Columns: {', '.join(col_names)}):\n")
-                    for pk in rows_only_in_db1:
-                        row_dict = {col: self._round_if_float(val) for col, val in zip(col_names, db1_map[pk])}
-                        diff_report.append(f"    {row_dict}\n")
-                
-                if rows_only_in_db2:
-                    diff_report.append(f"  Rows only in DB2 (Columns: {', '.join(col_names)}):\n")
-                    for pk in rows_only_in_db2:
-                        row_dict = {col: self._round_if_float(val) for col, val in zip(col_names, db2_map[pk])}
-                        diff_report.append(f"    {row_dict}\n")
-                
-                if modified_rows:
-                    diff_report.append("  Modified rows:\n")
-                    for pk, differences in modified_rows:
-                        if isinstance(pk, tuple):
-                            pk_dict = dict(zip(pk_cols, pk))
-                        else:
-                            pk_dict = {pk_cols[0]: pk}
-                        diff_report.append(f"    Primary Key: {pk_dict}\n")
-                        for col_name, val1, val2 in differences:
-                            rounded_val1 = self._round_if_float(val1)
-                            rounded_val2 = self._round_if_float(val2)
-                            diff_report.append(f"      {col_name}: {rounded_val1} → {rounded_val2}\n")
-                
-                diff_report.append("\n")
+        # Byte-identical files cannot differ in any table. filecmp stops at the
+        # first differing block, and the header's change counter usually differs
+        # within the first page, so this is nearly free when the files differ.
+        if filecmp.cmp(self.db1_path, self.db2_path, shallow=False):
+            yield "No data differences found\n"
+            self.update_progress("Databases are identical - data scan skipped", 100)
+            return
+        
+        tables = sorted(common_tables)
+        # Column info is resolved here, on the connections owned by this thread;
+        # the workers only ever touch their own connections.
+        table_columns = {
+            table: (self.get_column_info(self.db1_conn, table),
+                    self.get_column_info(self.db2_conn, table))
+            for table in tables
+        }
+        
+        results = {}
+        next_table = 0
+        self._worker_local = threading.local()
+        self._worker_conns = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(MAX_COMPARE_WORKERS, len(tables))),
+                thread_name_prefix="dbcmp-data"
+            ) as executor:
+                futures = {
+                    executor.submit(self._diff_one_table, table, *table_columns[table]): table
+                    for table in tables
+                }
+                # Progress is reported from this thread only, as tables finish
+                for done, future in enumerate(as_completed(futures), 1):
+                    table = futures[future]
+                    results[table] = future.result()
+                    self.update_progress(f"Compared data in table: {table}", 80 + int(20 * done / len(tables)))
+                    # Emit in table order so the report does not depend on thread timing
+                    while next_table < len(tables) and tables[next_table] in results:
+                        table_report, visual_diff_entries, found = results.pop(tables[next_table])
+                        next_table += 1
+                        self.visual_diff_data.extend(visual_diff_entries)
+                        data_differences_found = data_differences_found or found
+                        yield table_report
+        finally:
+            for conn in self._worker_conns:
+                conn.close()
+            self._worker_conns = []
         
         if not data_differences_found:
-            diff_report.append("No data differences found\n")
+            yield "No data differences found\n"
         
         self.update_progress("Data comparison complete", 100)
-        return "".join(diff_report)
 
-    def _fetch_all_data(self, conn: sqlite3.Connection, table: str, 
-                       columns: List[str], order_by: str) -> List[Tuple]:
+    def _worker_connection(self) -> sqlite3.Connection:
+        """Return this thread's DB1 connection, with DB2 attached as 'db2'."""
+        conn = getattr(self._worker_local, 'conn', None)
+        if conn is None:
+            conn = _open_ro(self.db1_path, check_same_thread=False)
+            conn.execute("ATTACH DATABASE ? AS db2;", (self.db2_path,))
+            self._worker_local.conn = conn
+            with self._worker_lock:
+                self._worker_conns.append(conn)
+        return conn
+
+    def _diff_one_table(self, table: str, db1_cols: List[Dict], db2_cols: List[Dict]):
+        """Diff one table's data. Returns (report text, visual diff entries, differences found).
+
+        Runs on a worker thread, so it must not touch db1_conn/db2_conn.
+        """
+        if len(db1_cols) != len(db2_cols):
+            return f"*Table: {table}* has different column structures - skipping data comparison\n\n", [], False
+        
+        pk_cols = [col['name'] for col in db1_cols if col['pk']] or [col['name'] for col in db1_cols]
+        col_names = [col['name'] for col in db1_cols]
+
+        # Only rows without an identical twin on the other side come back;
+        # the merge below classifies them as added/removed/modified.
+        db1_sql, db2_sql = self._changed_rows_sql(table, db1_cols, pk_cols)
+        conn = self._worker_connection()
+        db1_rows = self._fetch_changed_rows(conn, db1_sql)
+        db2_rows = self._fetch_changed_rows(conn, db2_sql)
+
+        pk_indices = [col_names.index(col) for col in pk_cols]
+        # itemgetter yields a scalar for one PK column and a tuple for several,
+        # which is exactly the shape the report uses for primary keys
+        pk_getter = operator.itemgetter(*pk_indices)
+        single_pk = len(pk_indices) == 1
+
+        def get_pk(row):
+            pk = pk_getter(row)
+            # Handle None values in primary keys by converting them to empty strings
+            if single_pk:
+                return '' if pk is None else pk
+            if None in pk:
+                return tuple('' if val is None else val for val in pk)
+            return pk
+
+        def merge_key(row):
+            if single_pk:
+                return _sqlite_sort_key(pk_getter(row))
+            return tuple(map(_sqlite_sort_key, pk_getter(row)))
+
+        # Decide once per table which columns take part in the comparison,
+        # rather than re-checking every column type for every row
+        compared_cols = [
+            (i, col['name']) for i, col in enumerate(db1_cols)
+            if not any(ignored in col['type'].lower() for ignored in self.ignored_data_types)
+        ]
+        row_differences = _build_row_differ(compared_cols)
+
+        rows_only_in_db1 = []
+        rows_only_in_db2 = []
+        modified_rows = []
+        visual_diff_entries = []
+
+        def advance(rows):
+            row = next(rows, None)
+            return row, (merge_key(row) if row is not None else None)
+
+        # Both streams are ordered by PK, so a single linear merge pairs them up;
+        # each row's key is computed once, when its cursor moves onto it
+        row1, key1 = advance(db1_rows)
+        row2, key2 = advance(db2_rows)
+        while row1 is not None or row2 is not None:
+            if row2 is None or (row1 is not None and key1 < key2):
+                rows_only_in_db1.append(row1)
+                row1, key1 = advance(db1_rows)
+            elif row1 is None or key2 < key1:
+                rows_only_in_db2.append(row2)
+                row2, key2 = advance(db2_rows)
+            else:
+                pk = get_pk(row1)
+
+                differences = row_differences(row1, row2)
+                if differences:
+                    modified_rows.append((pk, differences))
+                    # Store for visual viewer
+                    diff_entry = {
+                        "table": table,
+                        "pk": dict(zip(pk_cols, pk)) if isinstance(pk, tuple) else {pk_cols[0]: pk},
+                        "columns": [
+                            {"name": col_name, "db1": val1, "db2": val2}
+                            for col_name, val1, val2 in differences
+                        ]
+                    }
+                    visual_diff_entries.append(diff_entry)
+
+                row1, key1 = advance(db1_rows)
+                row2, key2 = advance(db2_rows)
+
+        if not (rows_only_in_db1 or rows_only_in_db2 or modified_rows):
+            return "", visual_diff_entries, False
+
+        diff_report = io.StringIO()
+        write = diff_report.write
+        write(f"*Table: {table}*\n")
+        col_names_joined = ", ".join(col_names)
+
+        if rows_only_in_db1:
+            write(f"  Rows only in DB1 (Columns: {col_names_joined}):\n")
+            for row in rows_only_in_db1:
+                row_dict = {col: self._round_if_float(val) for col, val in zip(col_names, row)}
+                write(f"    {row_dict}\n")
+
+        if rows_only_in_db2:
+            write(f"  Rows only in DB2 (Columns: {col_names_joined}):\n")
+            for row in rows_only_in_db2:
+                row_dict = {col: self._round_if_float(val) for col, val in zip(col_names, row)}
+                write(f"    {row_dict}\n")
+
+        if modified_rows:
+            write("  Modified rows:\n")
+            for pk, differences in modified_rows:
+                if isinstance(pk, tuple):
+                    pk_dict = dict(zip(pk_cols, pk))
+                else:
+                    pk_dict = {pk_cols[0]: pk}
+                write(f"    Primary Key: {pk_dict}\n")
+                for col_name, val1, val2 in differences:
+                    write(MODIFIED_VALUE_LINE.format(
+                        col_name, self._round_if_float(val1), self._round_if_float(val2)))
+
+        write("\n")
+        return diff_report.getvalue(), visual_diff_entries, True
+
+    def _changed_rows_sql(self, table: str, columns: List[Dict], pk_cols: List[str]) -> Tuple[str, str]:
+        """Build (DB1-only, DB2-only) EXCEPT queries for a table."""
+        # BINARY collation keeps SQLite's row order in step with _sqlite_sort_key
+        order_by = ", ".join(f"{_safe_ident(col)} COLLATE BINARY" for col in pk_cols)
+
+        # Floats are rounded to the requested precision inside SQLite, so rows that
+        # only differ past that precision never leave the EXCEPT and matched rows
+        # compare with plain equality. PK columns are left exact for the merge.
+        precision = int(self.decimal_precision)
+        select_cols = []
+        for col in columns:
+            ident = _safe_ident(col['name'])
+            if col['name'] not in pk_cols and _may_hold_real(col['type']):
+                select_cols.append(f"CASE WHEN typeof({ident}) = 'real' "
+                                   f"THEN ROUND({ident}, {precision}) ELSE {ident} END AS {ident}")
+            else:
+                select_cols.append(ident)
+        columns_str = ", ".join(select_cols)
+
+        tbl = _safe_ident(table)
+        main_select = f"SELECT {columns_str} FROM main.{tbl}"
+        db2_select = f"SELECT {columns_str} FROM db2.{tbl}"
+        return (f"{main_select} EXCEPT {db2_select} ORDER BY {order_by};",
+                f"{db2_select} EXCEPT {main_select} ORDER BY {order_by};")
+
+    def _fetch_changed_rows(self, conn: sqlite3.Connection, query: str) -> Iterator[Tuple]:
+        """Stream the rows returned by one of the _changed_rows_sql queries.
+
+        Both databases live on conn (DB2 is attached as 'db2'), so the set
+        difference runs in SQLite and only differing rows reach Python. Rows are
+        streamed in FETCH_BATCH_SIZE batches rather than materialised up front.
+        """
         cursor = conn.cursor()
-        columns_str = ", ".join(columns)
-        query = f"SELECT {columns_str} FROM {table} ORDER BY {order_by};"
+        cursor.arraysize = FETCH_BATCH_SIZE
         cursor.execute(query)
-        return cursor.fetchall()
+        while rows := cursor.fetchmany():
+            yield from rows
 
 class DatabaseComparisonTab(ttk.Frame):
     def __init__(self, parent):
@@ -687,6 +1394,7 @@ class DatabaseComparisonTab(ttk.Frame):
         
         # Current theme (default to dark)
         self.current_theme = "cyborg"
+        import ttkbootstrap as ttkb
         self.style = ttkb.Style(theme=self.current_theme)
         
         # Font configuration
@@ -695,6 +1403,20 @@ class DatabaseComparisonTab(ttk.Frame):
         self.text_font = font.Font(family="Consolas", size=10)
         self.title_font = font.Font(family="Calibri", size=12, weight="bold")
         
+        # Progressive rendering state for large reports (see display_results)
+        self._pending_lines = None
+        self._render_job = None
+        # Report file being paged in by display_results_file, and its line reader
+        self._report_path = None
+        self._report_lines = None
+        atexit.register(self._release_report)
+        self._last_progress_ts = 0.0  # last progress repaint, time.monotonic()
+        
+        # One long-lived worker runs every comparison, reusing self.comparator.
+        # It is a daemon thread so closing the window never waits on a compare.
+        self._compare_jobs = queue.Queue()
+        Thread(target=self._compare_worker, name="dbcmp-compare", daemon=True).start()
+        
         self.create_widgets()
         self.setup_theme_colors()
     
@@ -714,34 +1436,7 @@ class DatabaseComparisonTab(ttk.Frame):
         )
         
         # Configure tags for both themes
-        if self.current_theme == "cyborg":
-            # Dark theme colors
-            tag_colors = {
-                'version': '#5D9BFF',
-                'schema': '#B57DFF',
-                'data': '#FFA040',
-                'table': '#00E5D2',
-                'added': '#7CFC00',
-                'removed': '#FF6B6B',
-                'modified': '#FFD700',
-                'column': '#E066FF',
-                'no_diff': '#90EE90',
-                'highlight': '#FFFF00'
-            }
-        else:
-            # Light theme colors
-            tag_colors = {
-                'version': '#1E56A0',
-                'schema': '#6A1B9A',
-                'data': '#E65100',
-                'table': '#00897B',
-                'added': '#2E7D32',
-                'removed': '#C62828',
-                'modified': '#F9A825',
-                'column': '#9C27B0',
-                'no_diff': '#4CAF50',
-                'highlight': '#FFFF00'
-            }
+        tag_colors = RESULT_TAG_COLORS.get(self.current_theme, RESULT_TAG_COLORS["pulse"])
         
         # Configure all tags
         for tag, color in tag_colors.items():
@@ -751,22 +1446,16 @@ class DatabaseComparisonTab(ttk.Frame):
         self.refresh_results_display()
 
     def refresh_results_display(self):
-        """Force a complete refresh of the results display"""
-        if hasattr(self, 'last_diff_report'):
-            # Save scroll position
-            xview = self.result_text.xview()
-            yview = self.result_text.yview()
-            
-            # Get current content
-            current_content = self.result_text.get("1.0", tk.END)
-            
-            # Clear and re-insert content
-            self.result_text.delete("1.0", tk.END)
-            self.result_text.insert(tk.END, current_content)
-            
-            # Restore scroll position
-            self.result_text.xview_moveto(xview[0])
-            self.result_text.yview_moveto(yview[0])
+        """Repaint the results display after a colour change, keeping the scroll position"""
+        # Tag reconfiguration already marks the tagged text dirty; Tk redraws it
+        # without the content ever being read back out or re-inserted
+        xview = self.result_text.xview()
+        yview = self.result_text.yview()
+        
+        self.result_text.update_idletasks()
+        
+        self.result_text.xview_moveto(xview[0])
+        self.result_text.yview_moveto(yview[0])
     
     def toggle_validation_state(self):
         """Update the validation status label based on toggle state"""
@@ -826,7 +1515,7 @@ class DatabaseComparisonTab(ttk.Frame):
         ttk.Label(filter_frame, text="Exclude Tables (comma separated):").grid(row=1, column=0, sticky=tk.W)
         self.exclude_entry = ttk.Entry(filter_frame)
         self.exclude_entry.grid(row=1, column=1, padx=5, sticky="ew", columnspan=2)
-        self.exclude_entry.insert(0, ", ".join(sorted(DEFAULT_EXCLUDED_TABLES)))
+        self.exclude_entry.insert(0, DEFAULT_EXCLUDED_TABLES_TEXT)
 
         # Options frame
         options_frame = ttk.LabelFrame(main_frame, text="Comparison Options", padding="10")
@@ -970,34 +1659,45 @@ class DatabaseComparisonTab(ttk.Frame):
         self.context_menu.add_command(label="📋 Copy", command=self.copy_text)
         self.context_menu.add_command(label="🧹 Clear Results", command=self.clear_results)
         self.result_text.bind("<Button-3>", self.show_context_menu)
+        # tk_popup leaves a grab behind only on X11; elsewhere releasing is a no-op
+        self._menu_needs_release = self.tk.call("tk", "windowingsystem") == "x11"
     
     def show_context_menu(self, event):
         try:
             self.context_menu.tk_popup(event.x_root, event.y_root)
         finally:
-            self.context_menu.grab_release()
+            if self._menu_needs_release:
+                self.context_menu.grab_release()
     
     def copy_text(self):
-        selected_text = self.result_text.get(tk.SEL_FIRST, tk.SEL_LAST)
+        try:
+            selected_text = self.result_text.get(tk.SEL_FIRST, tk.SEL_LAST)
+        except tk.TclError:
+            return  # nothing selected
         if selected_text:
-            self.clipboard_clear()
-            self.clipboard_append(selected_text)
+            # Clear and append together once the menu has closed
+            self.after_idle(self._set_clipboard, selected_text)
+    
+    def _set_clipboard(self, text: str):
+        self.clipboard_clear()
+        self.clipboard_append(text)
     
     def clear_results(self):
+        self._cancel_render()
         self.result_text.delete(1.0, tk.END)
     
     def reset_ui(self):
         """Reset all inputs and outputs"""
-        self.comparator = DatabaseComparator()
-        self.comparator.set_progress_callback(self.update_progress)
+        self.comparator.reset()
         self.db1_entry.delete(0, tk.END)
         self.db2_entry.delete(0, tk.END)
         self.include_entry.delete(0, tk.END)
         self.exclude_entry.delete(0, tk.END)
-        self.exclude_entry.insert(0, ", ".join(sorted(DEFAULT_EXCLUDED_TABLES)))
+        self.exclude_entry.insert(0, DEFAULT_EXCLUDED_TABLES_TEXT)
         self.validate_db_var.set(True)
         self.ignore_datetime_var.set(True)
         self.decimal_precision_var.set(str(DEFAULT_DECIMAL_PRECISION))
+        self._cancel_render()
         self.result_text.delete(1.0, tk.END)
         self.status_var.set("Ready")
         self.progress_var.set(0)
@@ -1027,7 +1727,12 @@ class DatabaseComparisonTab(ttk.Frame):
         self.status_var.set(message)
         if percent is not None:
             self.progress_var.set(percent)
-        self.update_idletasks()
+        # The variables always hold the latest value; repaint at most once per
+        # PROGRESS_REDRAW_INTERVAL, and always for the final update
+        now = time.monotonic()
+        if percent == 100 or now - self._last_progress_ts >= PROGRESS_REDRAW_INTERVAL:
+            self._last_progress_ts = now
+            self.update_idletasks()
     
     def compare_databases(self):
         db1_path = self.db1_entry.get()
@@ -1037,100 +1742,189 @@ class DatabaseComparisonTab(ttk.Frame):
             messagebox.showerror("Error", "Please select both database files")
             return
         
-        # Get filters
-        included_tables = set()
-        include_text = self.include_entry.get().strip()
-        if include_text:
-            included_tables = {t.strip() for t in include_text.split(",") if t.strip()}
-        
-        excluded_tables = set()
-        exclude_text = self.exclude_entry.get().strip()
-        if exclude_text:
-            excluded_tables = {t.strip() for t in exclude_text.split(",") if t.strip()}
+        # Get filters. Names stay case-sensitive, matching the comparator's lookups.
+        included_tables = _parse_table_list(self.include_entry.get())
+        excluded_tables = _parse_table_list(self.exclude_entry.get())
         
         # Get options
         ignore_datetime = self.ignore_datetime_var.get()
         validate_db = self.validate_db_var.get()
-        try:
-            decimal_precision = int(self.decimal_precision_var.get())
-            if decimal_precision < 0 or decimal_precision > 15:
-                raise ValueError
-        except ValueError:
+        precision_text = self.decimal_precision_var.get().strip()
+        # isascii() keeps out digit characters such as '²' that int() rejects
+        if not (precision_text.isascii() and precision_text.isdigit() and int(precision_text) <= 15):
             messagebox.showerror("Error", "Decimal precision must be between 0 and 15")
             return
+        decimal_precision = int(precision_text)
         
         try:
             self.compare_btn.config(state=tk.DISABLED)
             self.reset_btn.config(state=tk.DISABLED)
+            self._cancel_render()
             self.result_text.delete(1.0, tk.END)
             self.result_text.insert(tk.END, "Comparing databases...\n")
             
-            # Run comparison in background thread
-            thread = threading.Thread(
-                target=self._run_comparison_thread,
-                args=(db1_path, db2_path, included_tables, excluded_tables, 
-                     ignore_datetime, decimal_precision, validate_db),
-                daemon=True
-            )
-            thread.start()
+            # Run comparison on the background worker
+            self._compare_jobs.put((
+                self._run_comparison_thread,
+                (db1_path, db2_path, included_tables, excluded_tables,
+                 ignore_datetime, decimal_precision, validate_db)
+            ))
             
         except Exception as e:
             self.handle_error(str(e))
             self.compare_btn.config(state=tk.NORMAL)
             self.reset_btn.config(state=tk.NORMAL)
     
+    def _compare_worker(self):
+        while True:
+            func, args = self._compare_jobs.get()
+            func(*args)
+
     def _run_comparison_thread(self, db1_path, db2_path, included_tables, 
                              excluded_tables, ignore_datetime, 
                              decimal_precision, validate_db):
+        # The comparator writes the report straight to a file, section by
+        # section, and the UI pages it in from there
+        fd, report_path = tempfile.mkstemp(prefix="dbcmp_report_", suffix=".txt")
+        os.close(fd)
         try:
-            diff_report = self.comparator.compare_databases(
+            differs = self.comparator.compare_databases_to_file(
                 db1_path, db2_path,
                 included_tables, excluded_tables,
                 ignore_datetime, decimal_precision,
-                validate_db
+                validate_db, out_path=report_path
             )
-            
-            self.after(0, self.display_results, diff_report)
         except Exception as e:
-            self.after(0, self.handle_error, str(e))
-        finally:
-            self.after(0, lambda: self.compare_btn.config(state=tk.NORMAL))
-            self.after(0, lambda: self.reset_btn.config(state=tk.NORMAL))
-            self.after(0, self.update_progress, "Comparison complete", 100)
+            _remove_quietly(report_path)
+            self.after(0, self._on_compare_finished, None, False, str(e))
+        else:
+            self.after(0, self._on_compare_finished, report_path, not differs, None)
+    
+    def _on_compare_finished(self, report_path: Optional[str], no_diff: bool,
+                             error_msg: Optional[str]):
+        """Apply every end-of-comparison UI update in one main-loop callback."""
+        self.compare_btn.config(state=tk.NORMAL)
+        self.reset_btn.config(state=tk.NORMAL)
+        self.update_progress("Comparison complete", 100)
+        if error_msg is not None:
+            self.handle_error(error_msg)
+        else:
+            self.display_results_file(report_path, no_diff)
     
+    @staticmethod
+    def _result_line_tag(line: str) -> Optional[str]:
+        """Return the colour tag for one line of the diff report, or None."""
+        if line.startswith('==='):
+            if 'Database Version' in line:
+                return 'version'
+            if 'Schema Differences' in line:
+                return 'schema'
+            if 'Data Differences' in line:
+                return 'data'
+            return None
+        if line.startswith('*Table:'):
+            return 'table'
+        if 'Columns:' in line:
+            return 'column'
+        if 'only in DB1' in line or 'only in DB2' in line:
+            return 'removed' if 'DB1' in line else 'added'
+        if REPORT_ARROW in line:
+            return 'modified'
+        if 'No ' in line and 'differences' in line:
+            return 'no_diff'
+        return None
+
+    def _tagged_lines(self, lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str]]:
+        """Yield (tag, newline-terminated line) pairs without splitting the report up front."""
+        line_tag = self._result_line_tag  # bound once, not looked up per line
+        for line in lines:
+            if line[-1:] != '\n':
+                line += '\n'
+            yield line_tag(line), line
+
+    @staticmethod
+    def _mapped_report_lines(report_path: str) -> Iterator[str]:
+        """Yield a report file's lines through a read-only mmap."""
+        with open(report_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in iter(mm.readline, b""):
+                    yield raw.decode('utf-8')
+
+    def _release_report(self):
+        """Close the report file being paged in, if any, and delete it."""
+        if self._report_lines is not None:
+            self._report_lines.close()  # unmaps and closes the file
+            self._report_lines = None
+        if self._report_path is not None:
+            _remove_quietly(self._report_path)
+            self._report_path = None
+
+    def _cancel_render(self):
+        """Stop appending a previous report to the results widget."""
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self._pending_lines = None
+        self._release_report()
+
+    def _render_next_chunk(self):
+        """Append the next RESULT_RENDER_CHUNK report lines, then yield to the event loop."""
+        self._render_job = None
+        if self._pending_lines is None:
+            return
+        chunk = list(islice(self._pending_lines, RESULT_RENDER_CHUNK))
+        # The whole chunk goes in with one insert; each run of consecutive lines
+        # sharing a tag is then coloured by line range with one tag_add
+        text_widget = self.result_text
+        tag_add = text_widget.tag_add
+        first_line = int(text_widget.index("end-1c").split(".")[0])
+        text_widget.insert(tk.END, "".join(line for _, line in chunk))
+        for tag, lines in groupby(chunk, key=operator.itemgetter(0)):
+            count = sum(1 for _ in lines)
+            if tag:
+                tag_add(tag, f"{first_line}.0", f"{first_line + count}.0")
+            first_line += count
+        if len(chunk) == RESULT_RENDER_CHUNK:
+            self._render_job = self.after(1, self._render_next_chunk)
+        else:
+            self._pending_lines = None
+            self._release_report()
+
     def display_results(self, diff_report: str):
+        self._cancel_render()
         self.result_text.delete(1.0, tk.END)
         
-        if "No differences found" in diff_report:
+        if NO_DIFFERENCES_MARKER in diff_report:
             self.result_text.insert(tk.END, diff_report, 'no_diff')
             return
         
-        current_section = None
-        for line in diff_report.splitlines():
-            if line.startswith('==='):
-                if 'Database Version' in line:
-                    current_section = 'version'
-                    self.result_text.insert(tk.END, line + '\n', 'version')
-                elif 'Schema Differences' in line:
-                    current_section = 'schema'
-                    self.result_text.insert(tk.END, line + '\n', 'schema')
-                elif 'Data Differences' in line:
-                    current_section = 'data'
-                    self.result_text.insert(tk.END, line + '\n', 'data')
-                else:
-                    self.result_text.insert(tk.END, line + '\n')
-            elif line.startswith('*Table:'):
-                self.result_text.insert(tk.END, line + '\n', 'table')
-            elif 'Columns:' in line:
-                self.result_text.insert(tk.END, line + '\n', 'column')
-            elif any(x in line for x in ['only in DB1', 'only in DB2']):
-                self.result_text.insert(tk.END, line + '\n', 'removed' if 'DB1' in line else 'added')
-            elif '→' in line:
-                self.result_text.insert(tk.END, line + '\n', 'modified')
-            elif 'No ' in line and 'differences' in line:
-                self.result_text.insert(tk.END, line + '\n', 'no_diff')
-            else:
-                self.result_text.insert(tk.END, line + '\n')
+        self._start_render(io.StringIO(diff_report))
+
+    def display_results_file(self, report_path: str, no_diff: bool):
+        """Show a report written by compare_databases_to_file, paging it in from the file.
+
+        The file is deleted once it has been rendered or the render is cancelled.
+        """
+        self._cancel_render()
+        self.result_text.delete(1.0, tk.END)
+        self._report_path = report_path
+        self._report_lines = self._mapped_report_lines(report_path)
+        
+        if no_diff:
+            # The "no differences" summary is a few lines; no need to page it
+            self.result_text.insert(tk.END, "".join(self._report_lines), 'no_diff')
+            self._release_report()
+            return
+        
+        self._start_render(self._report_lines)
+
+    def _start_render(self, lines: Iterable[str]):
+        # The first screenful goes in now; the rest is appended in chunks between
+        # events, so Tk never has to lay out a huge report in one blocking call
+        self._pending_lines = self._tagged_lines(lines)
+        self._render_next_chunk()
         
         self.result_text.see("1.0")
 
@@ -1181,56 +1975,85 @@ class DatabaseComparisonTab(ttk.Frame):
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
         tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
 
-        # Grid layout
-        tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-
-        # Configure grid weights
-        tree_frame.rowconfigure(0, weight=1)
-        tree_frame.columnconfigure(0, weight=1)
-
+        # Tag changed rows as they are inserted, colouring the tag once for the
+        # current theme. The tree is filled before it is gridded, so Tk lays it
+        # out once rather than after every insert.
+        if self.current_theme == "cyborg":
+            tree.tag_configure("changed", background="#2C2C2C", foreground="#FFFFFF")
+        else:
+            # Light theme colors
+            tree.tag_configure("changed", background="#EBEEEF", foreground="#080808")
 
-        # Populate tree with data
         for row in data:
-            table = row["table"]
+            # Built once per modified row and shared by each of its column rows;
+            # interning lets the same table name be one string across the tree
+            table = sys.intern(row["table"])
             pk = ", ".join(f"{k}={v}" for k, v in row["pk"].items())
             for col in row["columns"]:
                 db1 = str(col["db1"])
                 db2 = str(col["db2"])
-                tree.insert("", tk.END, values=(table, pk, col["name"], db1, db2))
-
-        # Add color tags if needed
-        def style_row(event=None):
-            for item in tree.get_children():
-                values = tree.item(item)["values"]
-                if values[3] != values[4]:  # DB1 != DB2
-                    tree.item(item, tags=("changed",))
-                
-                is_dark = self.current_theme
-                if is_dark == "cyborg":
-                    tree.tag_configure("changed", background="#2C2C2C", foreground="#FFFFFF")   
-                else:
-                    # Light theme colors
-                    tree.tag_configure("changed", background="#EBEEEF", foreground="#080808")
-            
+                tree.insert("", tk.END, values=(table, pk, col["name"], db1, db2),
+                            tags=("changed",) if db1 != db2 else ())
 
-        tree.bind("<<TreeviewOpen>>", style_row)
+        # Grid layout
+        tree.grid(row=0, column=0, sticky="nsew")
+        vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
 
-        style_row()
+        # Configure grid weights
+        tree_frame.rowconfigure(0, weight=1)
+        tree_frame.columnconfigure(0, weight=1)
 
     def handle_error(self, error_msg: str):
         messagebox.showerror("Error", error_msg)
         logging.error(error_msg)
         self.status_var.set(f"Error: {error_msg}")
 
+class WorkerStatusMixin:
+    """Status and progress updates for a tab whose work runs on worker threads.
+
+    Tk widgets may only be touched from the main loop, so workers post through
+    after(). Status lines are buffered and inserted into status_text by one
+    _flush_status per STATUS_FLUSH_INTERVAL_MS; call _init_status_buffer first.
+    """
+
+    def _init_status_buffer(self):
+        self._status_lock = threading.Lock()
+        self._status_buffer = []
+        self._status_flush_pending = False
+
+    def _post_progress(self, value):
+        self.after(0, lambda: self.progress_bar.configure(value=value))
+
+    def _post_status(self, message, tag=None):
+        with self._status_lock:
+            self._status_buffer.append((message, tag))
+            if self._status_flush_pending:
+                return
+            self._status_flush_pending = True
+        self.after(STATUS_FLUSH_INTERVAL_MS, self._flush_status)
+
+    def _flush_status(self):
+        with self._status_lock:
+            pending, self._status_buffer = self._status_buffer, []
+            self._status_flush_pending = False
+        chunks = []
+        for message, tag in pending:
+            chunks += (message, tag or ())
+        self.status_text.insert(tk.END, *chunks)
+
+
 # ----------------- Database Sanitization Tool -----------------
 
 
-class DatabaseSanitizerTab(ttk.Frame):
+class DatabaseSanitizerTab(WorkerStatusMixin, ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
+        import ttkbootstrap as ttkb
         self.style = ttkb.Style()  # <-- Add this line
+        self._init_status_buffer()
+        # .vyb outputs not written yet: archive name -> .vyp to pack on download
+        self._pending_vyb_sources = {}
         self.create_widgets()
         self.setup_theme_colors()
         
@@ -1239,16 +2062,10 @@ class DatabaseSanitizerTab(ttk.Frame):
     
     def setup_theme_colors(self):
         """Set color tags based on current theme"""
-        if self.style.theme_use() == "cyborg":
-            # Dark theme colors
-            self.status_text.tag_config('error', foreground='#FF6B6B')
-            self.status_text.tag_config('success', foreground='#7CFC00')
-            self.status_text.configure(bg='#222222', fg='#FFFFFF')
-        else:
-            # Light theme colors
-            self.status_text.tag_config('error', foreground='red')
-            self.status_text.tag_config('success', foreground='green')
-            self.status_text.configure(bg='#FFFFFF', fg='#000000')
+        colors = STATUS_THEME_COLORS.get(self.style.theme_use(), STATUS_THEME_COLORS["pulse"])
+        for tag, foreground in colors["tags"].items():
+            self.status_text.tag_config(tag, foreground=foreground)
+        self.status_text.configure(bg=colors["bg"], fg=colors["fg"])
     
     def create_widgets(self):
         # Main frame
@@ -1365,9 +2182,6 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
         )
         self.status_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Configure text tags for styling
-        self.setup_theme_colors()
-        
         # Download buttons
         download_frame = ttk.Frame(main_frame)
         download_frame.pack(pady=10, padx=20)
@@ -1375,7 +2189,7 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
         self.download_vyb_button = ttk.Button(
             download_frame, 
             text="⬇️ Download .vyb", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyb, 
             bootstyle="primary",
             width=20
@@ -1385,30 +2199,49 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
         self.download_vyp_button = ttk.Button(
             download_frame, 
             text="⬇️ Download .vyp", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyp, 
             bootstyle="primary",
             width=20
         )
         self.download_vyp_button.pack(side=tk.LEFT, padx=5)
     
+    # process_file and do_conversion_and_repacking run on worker threads and
+    # report through _post_status/_post_progress
+    def _enable_downloads(self):
+        self.download_vyb_button.config(state=tk.NORMAL)
+        self.download_vyp_button.config(state=tk.NORMAL)
+
     def unzip_vyb(self, vyb_file, extract_to):
-        with zipfile.ZipFile(vyb_file, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        return unpack_vyp_from_vyb(vyb_file, extract_to)
 
     def zip_vyp(self, vyp_file, vyb_file):
-        with zipfile.ZipFile(vyb_file, 'w') as zip_ref:
-            zip_ref.write(vyp_file, os.path.basename(vyp_file))
+        pack_vyp_into_vyb(vyp_file, vyb_file)
 
-    def execute_queries_and_save(self, input_db, output_db, queries):
+    def execute_queries_and_save(self, input_db, output_db, script):
+        conn = None
         try:
+            # The script runs in a transaction of its own: drop the user's
+            # BEGIN/COMMIT, and refuse a ROLLBACK rather than apply what it discards
+            statements = []
+            for statement in _split_sql_script(script):
+                keyword = SQL_TRANSACTION_RE.match(statement, SQL_LEADING_NOISE_RE.match(statement).end())
+                if keyword is None:
+                    statements.append(statement)
+                elif keyword.group().upper() == "ROLLBACK":
+                    raise ValueError("ROLLBACK is not supported: the queries run as one transaction")
+
             # Copy the input database to the output database
-            shutil.copy(input_db, output_db)
+            _fast_copy(input_db, output_db)
 
             # Connect to the output database
             conn = sqlite3.connect(output_db)
             cursor = conn.cursor()
 
+            # The output is a scratch copy until it is downloaded, so skip
+            # fsyncs and keep the rollback journal off disk
+            cursor.executescript(SANITIZE_PRAGMAS)
+
             # Enable foreign key checks
             cursor.execute("PRAGMA foreign_keys = ON;")
 
@@ -1418,18 +2251,20 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
             # if integrity_check[0] != "ok":
             #     raise sqlite3.Error(f"Database integrity check failed: {integrity_check[0]}")
 
-            # Execute each query
-            for query in queries:
-                if query.strip():  # Skip empty queries
-                    cursor.execute(query)
+            # Run every query in one transaction
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in statements:
+                cursor.execute(statement)
             conn.commit()
         except sqlite3.Error as e:
-            conn.rollback()
+            if conn:
+                conn.rollback()
             raise e
         finally:
-            conn.close()
+            if conn:
+                conn.close()
 
-    def process_file(self, input_file, queries):
+    def process_file(self, input_file, script):
         temp_dir = "temp"
         os.makedirs(temp_dir, exist_ok=True)
 
@@ -1442,50 +2277,34 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
 
             # If input is .vyb, unzip it to get .vyp
             if input_file.endswith(".vyb"):
-                self.progress_bar["value"] = 20
-                self.update()
-                self.unzip_vyb(input_file, temp_dir)
-                # Find the extracted .vyp file in the temp directory
-                extracted_files = os.listdir(temp_dir)
-                vyp_file = None
-                for file in extracted_files:
-                    if file.endswith(".vyp"):
-                        vyp_file = os.path.join(temp_dir, file)
-                        break
-                if not vyp_file:
-                    raise ValueError("No .vyp file found in the extracted .vyb archive.")
+                self._post_progress(20)
+                vyp_file = self.unzip_vyb(input_file, temp_dir)
             else:
                 # If input is .vyp, use it directly
                 vyp_file = input_file
 
-            self.progress_bar["value"] = 40
-            self.update()
+            self._post_progress(40)
 
             # Execute the queries and save the modified database
-            self.execute_queries_and_save(vyp_file, output_vyp, queries)
+            self.execute_queries_and_save(vyp_file, output_vyp, script)
 
-            self.progress_bar["value"] = 60
-            self.update()
+            self._post_progress(60)
 
-            # Always generate both .vyp and .vyb files
-            # Zip the .vyp file into .vyb
-            self.zip_vyp(output_vyp, output_vyb)
+            # The .vyb is only deflated if the user downloads it
+            self._pending_vyb_sources[os.path.basename(output_vyb)] = output_vyp
 
-            self.progress_bar["value"] = 100
-            self.update()
-            self.status_text.insert(tk.END, f"✓ Output .vyp file generated: {output_vyp}\n", 'success')
-            self.status_text.insert(tk.END, f"✓ Output .vyb file generated: {output_vyb}\n", 'success')
+            self._post_progress(100)
+            self._post_status(f"✓ Output .vyp file generated: {output_vyp}\n", 'success')
+            self._post_status(f"✓ Output .vyb file ready (packed on download): {output_vyb}\n", 'success')
             logging.info(f"Output .vyp file generated: {output_vyp}")
-            logging.info(f"Output .vyb file generated: {output_vyb}")
 
-            # Enable download buttons if the output files exist
-            if os.path.exists(output_vyp) and os.path.exists(output_vyb):
-                self.download_vyb_button.config(state=NORMAL)
-                self.download_vyp_button.config(state=NORMAL)
+            # Enable download buttons if the output file exists
+            if os.path.exists(output_vyp):
+                self.after(0, self._enable_downloads)
         except Exception as e:
-            self.status_text.insert(tk.END, f"✗ Error: {str(e)}\n", 'error')
+            self._post_status(f"✗ Error: {str(e)}\n", 'error')
             logging.error(f"Error: {str(e)}")
-            self.progress_bar["value"] = 0
+            self._post_progress(0)
 
     def convert_file(self):
         input_file = self.input_file_entry.get()
@@ -1506,91 +2325,62 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
             base_name = os.path.splitext(input_filename)[0]
             input_ext = os.path.splitext(input_file)[1].lower()
             
-            self.progress_bar["value"] = 10
-            self.update()
+            self._post_progress(10)
             
             if input_ext == ".vyb":
                 # First unzip the .vyb file to get the .vyp
-                self.unzip_vyb(input_file, temp_dir)
-                
-                # Find the extracted .vyp file
-                extracted_files = os.listdir(temp_dir)
-                vyp_file = None
-                for file in extracted_files:
-                    if file.endswith(".vyp"):
-                        vyp_file = os.path.join(temp_dir, file)
-                        break
+                vyp_file = self.unzip_vyb(input_file, temp_dir)
                 
-                if not vyp_file:
-                    raise ValueError("No .vyp file found in the extracted .vyb archive.")
-                
-                self.progress_bar["value"] = 30
-                self.update()
+                self._post_progress(30)
                 
                 # Create converted .vyp file (just rename the extracted file)
                 converted_vyp = os.path.join(temp_dir, f"converted_{base_name}_{timestamp}.vyp")
                 os.rename(vyp_file, converted_vyp)
                 
-                # Create repacked .vyb file (zip the .vyp back to .vyb)
+                # Repacked .vyb (the .vyp zipped back) and the converted .vyp to .vyb
+                # hold the same archive; both are packed from converted_vyp on download
                 repacked_vyb = os.path.join(temp_dir, f"repacked_{base_name}_{timestamp}.vyb")
-                self.zip_vyp(converted_vyp, repacked_vyb)
-                
-                self.progress_bar["value"] = 70
-                self.update()
-                
-                # Also create a converted .vyp to .vyb conversion (different from repacked)
                 converted_vyb = os.path.join(temp_dir, f"converted_{base_name}_to_vyb_{timestamp}.vyb")
-                self.zip_vyp(converted_vyb, converted_vyb)
+                self._pending_vyb_sources[os.path.basename(repacked_vyb)] = converted_vyp
+                self._pending_vyb_sources[os.path.basename(converted_vyb)] = converted_vyp
+                
+                self._post_progress(70)
                 
-                self.status_text.insert(tk.END, f"✓ Converted .vyp file generated: {converted_vyp}\n", 'success')
-                self.status_text.insert(tk.END, f"✓ Repacked .vyb file generated: {repacked_vyb}\n", 'success')
-                self.status_text.insert(tk.END, f"✓ Converted .vyb file generated: {converted_vyb}\n", 'success')
+                self._post_status(f"✓ Converted .vyp file generated: {converted_vyp}\n", 'success')
+                self._post_status(f"✓ Repacked .vyb file ready (packed on download): {repacked_vyb}\n", 'success')
+                self._post_status(f"✓ Converted .vyb file ready (packed on download): {converted_vyb}\n", 'success')
                 
             elif input_ext == ".vyp":
-                # Create converted .vyb file
+                # Converted .vyb file, packed from the input on download
                 converted_vyb = os.path.join(temp_dir, f"converted_{base_name}_{timestamp}.vyb")
-                self.zip_vyp(input_file, converted_vyb)
+                self._pending_vyb_sources[os.path.basename(converted_vyb)] = input_file
                 
-                self.progress_bar["value"] = 30
-                self.update()
+                self._post_progress(30)
                 
                 # Create repacked .vyp file (just copy with new name)
                 repacked_vyp = os.path.join(temp_dir, f"repacked_{base_name}_{timestamp}.vyp")
-                shutil.copy(input_file, repacked_vyp)
+                _fast_copy(input_file, repacked_vyp)
                 
-                self.progress_bar["value"] = 70
-                self.update()
+                self._post_progress(70)
                 
-                # Also create a converted .vyb to .vyp conversion (unzip the just created .vyb)
-                self.unzip_vyb(converted_vyb, temp_dir)
+                # Also create a converted .vyb to .vyp conversion; unzipping the
+                # .vyb just created would only give back input_file's bytes
+                converted_vyp = os.path.join(temp_dir, f"converted_{base_name}_to_vyp_{timestamp}.vyp")
+                _fast_copy(input_file, converted_vyp)
                 
-                # Find the extracted .vyp file
-                extracted_files = os.listdir(temp_dir)
-                converted_vyp = None
-                for file in extracted_files:
-                    if file.endswith(".vyp") and file != os.path.basename(repacked_vyp):
-                        converted_vyp = os.path.join(temp_dir, file)
-                        new_name = os.path.join(temp_dir, f"converted_{base_name}_to_vyp_{timestamp}.vyp")
-                        os.rename(converted_vyp, new_name)
-                        converted_vyp = new_name
-                        break
-                
-                self.status_text.insert(tk.END, f"✓ Converted .vyb file generated: {converted_vyb}\n", 'success')
-                self.status_text.insert(tk.END, f"✓ Repacked .vyp file generated: {repacked_vyp}\n", 'success')
-                if converted_vyp:
-                    self.status_text.insert(tk.END, f"✓ Converted .vyp file generated: {converted_vyp}\n", 'success')
+                self._post_status(f"✓ Converted .vyb file ready (packed on download): {converted_vyb}\n", 'success')
+                self._post_status(f"✓ Repacked .vyp file generated: {repacked_vyp}\n", 'success')
+                self._post_status(f"✓ Converted .vyp file generated: {converted_vyp}\n", 'success')
             
-            self.progress_bar["value"] = 100
-            self.update()
+            self._post_progress(100)
             
             # Enable download buttons
-            self.download_vyb_button.config(state=NORMAL)
-            self.download_vyp_button.config(state=NORMAL)
+            self.after(0, self._enable_downloads)
             
         except Exception as e:
-            self.status_text.insert(tk.END, f"✗ Error during conversion/repacking: {str(e)}\n", 'error')
+            self._post_status(f"✗ Error during conversion/repacking: {str(e)}\n", 'error')
             logging.error(f"Error during conversion/repacking: {str(e)}")
-            self.progress_bar["value"] = 0
+            self._post_progress(0)
 
     def browse_input_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("VYB & VYP Files", "*.vyb *.vyp")])
@@ -1599,14 +2389,14 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
 
     def execute_process(self):
         input_file = self.input_file_entry.get()
-        queries = self.query_entry.get("1.0", tk.END).strip().split(";")  # Split queries by ;
+        script = self.query_entry.get("1.0", tk.END).strip()
 
-        if not input_file or not queries:
+        if not input_file or not script:
             self.status_text.insert(tk.END, "✗ Error: Please provide both input file and SQL queries\n", 'error')
             return
 
         self.progress_bar["value"] = 0
-        Thread(target=self.process_file, args=(input_file, queries), daemon=True).start()
+        Thread(target=self.process_file, args=(input_file, script), daemon=True).start()
 
     def download_vyp(self):
         input_file = self.input_file_entry.get()
@@ -1618,12 +2408,10 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
         input_filename = os.path.basename(input_file)
         base_name = os.path.splitext(input_filename)[0]
         
-        possible_files = []
-        for f in os.listdir("temp"):
-            if (f.startswith(f"Sanitized_{base_name}") or 
-                f.startswith(f"converted_{base_name}") or 
-                f.startswith(f"repacked_{base_name}")) and f.endswith(".vyp"):
-                possible_files.append(f)
+        possible_files = _find_artifacts(
+            "temp",
+            (f"Sanitized_{base_name}", f"converted_{base_name}", f"repacked_{base_name}"),
+            ".vyp")
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No .vyp output files found for this input\n", 'error')
@@ -1652,7 +2440,7 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
                                                filetypes=[("VYP Files", "*.vyp")], 
                                                initialfile=selected_file)
         if file_path:
-            shutil.copy(output_vyp, file_path)
+            _fast_copy(output_vyp, file_path)
             self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
 
     def download_vyb(self):
@@ -1665,12 +2453,12 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
         input_filename = os.path.basename(input_file)
         base_name = os.path.splitext(input_filename)[0]
         
-        possible_files = []
-        for f in os.listdir("temp"):
-            if (f.startswith(f"Sanitized_{base_name}") or 
-                f.startswith(f"converted_{base_name}") or 
-                f.startswith(f"repacked_{base_name}")) and f.endswith(".vyb"):
-                possible_files.append(f)
+        prefixes = (f"Sanitized_{base_name}", f"converted_{base_name}", f"repacked_{base_name}")
+        possible_files = _find_artifacts("temp", prefixes, ".vyb")
+        # Outputs whose .vyb has not been packed yet
+        possible_files += sorted(
+            name for name, src in self._pending_vyb_sources.items()
+            if name.startswith(prefixes) and name not in possible_files and os.path.exists(src))
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No .vyb output files found for this input\n", 'error')
@@ -1699,14 +2487,30 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
                                                filetypes=[("VYB Files", "*.vyb")], 
                                                initialfile=selected_file)
         if file_path:
-            if selected_file.startswith(("converted_", "repacked_")):
-                shutil.copy(output_vyb, file_path)
+            # Packing deflates the whole database: keep it off the Tk thread
+            self.download_vyb_button.config(state=tk.DISABLED)
+            Thread(target=self.save_vyb, args=(selected_file, output_vyb, file_path), daemon=True).start()
+
+    def save_vyb(self, selected_file, output_vyb, file_path):
+        # Runs on a worker thread; reports through _post_status/_post_progress
+        try:
+            self._post_progress(0)
+            if selected_file in self._pending_vyb_sources:
+                # Deflate the source .vyp straight into the chosen location
+                self.zip_vyp(self._pending_vyb_sources[selected_file], file_path)
+            elif selected_file.startswith(("converted_", "repacked_")):
+                _fast_copy(output_vyb, file_path)
             else:
                 # For sanitized files, zip the corresponding .vyp file
                 output_vyp = output_vyb.replace(".vyb", ".vyp")
                 if os.path.exists(output_vyp):
                     self.zip_vyp(output_vyp, file_path)
-            self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
+            self._post_progress(100)
+            self._post_status(f"✓ File saved successfully: {file_path}\n", 'success')
+        except Exception as e:
+            self._post_status(f"✗ Error saving {file_path}: {str(e)}\n", 'error')
+        finally:
+            self.after(0, lambda: self.download_vyb_button.config(state=tk.NORMAL))
 
     def cleanup_temp_dir(self):
         if os.path.exists("temp"):
@@ -1715,10 +2519,12 @@ UPDATE repeat_invoice_template SET next_due_date = NULL, end_date = NULL, week_d
 
 # ----------------- FTS TAB -----------------
 
-class FTSTab(ttk.Frame):
+class FTSTab(WorkerStatusMixin, ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
+        import ttkbootstrap as ttkb
         self.style = ttkb.Style()
+        self._init_status_buffer()
         self.create_widgets()
         self.setup_theme_colors()
         
@@ -1727,16 +2533,10 @@ class FTSTab(ttk.Frame):
     
     def setup_theme_colors(self):
         """Set color tags based on current theme"""
-        if self.style.theme_use() == "cyborg":
-            # Dark theme colors
-            self.status_text.tag_config('error', foreground='#FF6B6B')
-            self.status_text.tag_config('success', foreground='#7CFC00')
-            self.status_text.configure(bg='#222222', fg='#FFFFFF')
-        else:
-            # Light theme colors
-            self.status_text.tag_config('error', foreground='red')
-            self.status_text.tag_config('success', foreground='green')
-            self.status_text.configure(bg='#FFFFFF', fg='#000000')
+        colors = STATUS_THEME_COLORS.get(self.style.theme_use(), STATUS_THEME_COLORS["pulse"])
+        for tag, foreground in colors["tags"].items():
+            self.status_text.tag_config(tag, foreground=foreground)
+        self.status_text.configure(bg=colors["bg"], fg=colors["fg"])
     
     def create_widgets(self):
         # Main frame
@@ -1839,9 +2639,6 @@ Note: This process may take several minutes for large databases.
         )
         self.status_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Configure text tags for styling
-        self.setup_theme_colors()
-        
         # Download buttons
         download_frame = ttk.Frame(main_frame)
         download_frame.pack(pady=10, padx=20)
@@ -1849,7 +2646,7 @@ Note: This process may take several minutes for large databases.
         self.download_vyb_button = ttk.Button(
             download_frame, 
             text="⬇️ Download .vyb", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyb, 
             bootstyle="primary",
             width=20
@@ -1859,32 +2656,45 @@ Note: This process may take several minutes for large databases.
         self.download_vyp_button = ttk.Button(
                        download_frame, 
             text="⬇️ Download .vyp", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyp, 
             bootstyle="primary",
             width=20
         )
         self.download_vyp_button.pack(side=tk.LEFT, padx=5)
     
+    def _enable_downloads(self):
+        self.download_vyb_button.config(state=tk.NORMAL)
+        self.download_vyp_button.config(state=tk.NORMAL)
+
     def unzip_vyb(self, vyb_file, extract_to):
-        with zipfile.ZipFile(vyb_file, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        return unpack_vyp_from_vyb(vyb_file, extract_to)
 
     def zip_vyp(self, vyp_file, vyb_file):
-        with zipfile.ZipFile(vyb_file, 'w') as zip_ref:
-            zip_ref.write(vyp_file, os.path.basename(vyp_file))
+        pack_vyp_into_vyb(vyp_file, vyb_file)
 
     def create_fts_table(self, input_db, output_db):
+        conn = None
         try:
             # Copy the input database to the output database
-            shutil.copy(input_db, output_db)
+            _fast_copy(input_db, output_db)
 
             # Connect to the output database
-            conn = sqlite3.connect(output_db)
+            conn = sqlite3.connect(output_db, cached_statements=STATEMENT_CACHE_SIZE)
             cursor = conn.cursor()
 
-            # Enable foreign key checks
-            cursor.execute("PRAGMA foreign_keys = ON;")
+            # Scratch copy until it is downloaded: trade durability for speed
+            cursor.executescript(FTS_BUILD_PRAGMAS)
+            # Let the join read pages straight from the page cache instead of pread()
+            mmap_size = min(os.path.getsize(output_db) * 2, FTS_MMAP_LIMIT)
+            cursor.execute(f"PRAGMA mmap_size = {mmap_size};")
+
+            # No per-row foreign key lookups: the FTS tables have no references
+            # and the copied rows are left as they were
+            cursor.execute("PRAGMA foreign_keys = OFF;")
+
+            # One transaction for the drops, the rebuild and the FTS3 shadow-table writes
+            cursor.execute("BEGIN IMMEDIATE;")
 
             # Check database integrity
             # cursor.execute("PRAGMA integrity_check;")
@@ -1910,88 +2720,84 @@ Note: This process may take several minutes for large databases.
                 fts_text,
             );""")
             
-            # Data population query
+            # Index the join keys so the population query does not rescan them per row
+            for index_name, table, column in FTS_JOIN_INDEXES:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column});")
+
+            # Data population query. Payment references and line items are
+            # gathered per transaction by correlated subqueries that seek the
+            # indexes above, so no GROUP BY sort or materialized join is needed
             cursor.execute("""
             INSERT INTO kb_fts_vtable(fts_name_id, fts_txn_id, fts_text) 
             SELECT 
                 t1.txn_name_id, 
                 t1.txn_id, 
-                REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(
-                    COALESCE(t1.party_phone, '') || ' ' || 
-                    COALESCE(t1.party_name, '') || ' ' || 
-                    COALESCE(t1.category_name, '') || ' ' || 
-                    COALESCE(t1.display_name, '') || ' ' || 
-                    COALESCE(t1.txn_description, '') || ' ' || 
-                    COALESCE(t1.cash_amount, '') || ' ' || 
-                    COALESCE(t1.balance_amount, '') || ' ' || 
-                    COALESCE(t1.total_amount, '') || ' ' || 
-                    COALESCE(t1.prefix, '') || ' ' || 
-                    COALESCE(t1.invoice_number, '') || ' ' || 
-                    COALESCE(t1.prefix, '') || COALESCE(t1.invoice_number,'') || ' ' || 
-                    COALESCE(t1.pr,'') || ' ' || 
-                    COALESCE(t1.txn_eway_bill_number,'') || ' ' || 
-                    COALESCE(group_concat(l1.ldata, ' '), ''), 
-                ' ', ' '), ' ', ' '), ' ', ' '), ' ', ' '), ' ', ' ') 
+                COALESCE(t1.party_phone, '') || ' ' || 
+                COALESCE(t1.party_name, '') || ' ' || 
+                COALESCE(t1.category_name, '') || ' ' || 
+                COALESCE(t1.display_name, '') || ' ' || 
+                COALESCE(t1.txn_description, '') || ' ' || 
+                COALESCE(t1.cash_amount, '') || ' ' || 
+                COALESCE(t1.balance_amount, '') || ' ' || 
+                COALESCE(t1.total_amount, '') || ' ' || 
+                COALESCE(t1.prefix, '') || ' ' || 
+                COALESCE(t1.invoice_number, '') || ' ' || 
+                COALESCE(t1.prefix, '') || COALESCE(t1.invoice_number,'') || ' ' || 
+                COALESCE(t1.pr,'') || ' ' || 
+                COALESCE(t1.txn_eway_bill_number,'') || ' ' || 
+                COALESCE(t1.ldata, '')
             FROM (
                 SELECT 
-                    txn.*, 
-                    group_concat(pm.payment_reference, ' ') pr 
-                FROM (
-                    SELECT 
-                        t.txn_id txn_id, 
-                        t.txn_name_id, 
-                        t.txn_cash_amount cash_amount, 
-                        t.txn_balance_amount balance_amount, 
-                        t.txn_cash_amount+t.txn_balance_amount total_amount, 
-                        p.prefix_value prefix, 
-                        t.txn_ref_number_char invoice_number, 
-                        t.txn_description txn_description, 
-                        t.txn_eway_bill_number txn_eway_bill_number, 
-                        t.txn_display_name display_name, 
-                        n.full_name party_name, 
-                        n.phone_number party_phone, 
-                        c.full_name category_name 
-                    FROM kb_transactions t 
-                    LEFT JOIN kb_names n ON t.txn_name_id = n.name_id 
-                    LEFT JOIN kb_names c ON t.txn_category_id = c.name_id 
-                    LEFT JOIN kb_prefix p ON t.txn_prefix_id = p.prefix_id
-                ) txn 
-                LEFT JOIN txn_payment_mapping pm ON txn.txn_id = pm.txn_id 
-                GROUP BY txn.txn_id
+                    t.txn_id txn_id, 
+                    t.txn_name_id, 
+                    t.txn_cash_amount cash_amount, 
+                    t.txn_balance_amount balance_amount, 
+                    t.txn_cash_amount+t.txn_balance_amount total_amount, 
+                    p.prefix_value prefix, 
+                    t.txn_ref_number_char invoice_number, 
+                    t.txn_description txn_description, 
+                    t.txn_eway_bill_number txn_eway_bill_number, 
+                    t.txn_display_name display_name, 
+                    n.full_name party_name, 
+                    n.phone_number party_phone, 
+                    c.full_name category_name, 
+                    (
+                        SELECT group_concat(pm.payment_reference, ' ') 
+                        FROM txn_payment_mapping pm 
+                        WHERE pm.txn_id = t.txn_id
+                    ) pr, 
+                    (
+                        SELECT group_concat(
+                            COALESCE(i.item_name, '') || ' ' || 
+                            COALESCE(i.item_code,'') || ' ' || 
+                            COALESCE(i.item_hsn_sac_code,'')|| ' ' || 
+                            COALESCE(l.lineitem_batch_number,'')|| ' ' || 
+                            COALESCE(l.lineitem_serial_number,'')|| ' ' || 
+                            COALESCE(l.lineitem_count,'')|| ' ' || 
+                            COALESCE(l.lineitem_description,'') || ' ' || 
+                            COALESCE((
+                                SELECT group_concat(sd.serial_number , ' ') 
+                                FROM kb_serial_mapping sm 
+                                LEFT JOIN kb_serial_details sd ON sm.serial_mapping_serial_id = sd.serial_id 
+                                WHERE sm.serial_mapping_lineitem_id = l.lineitem_id
+                            ),''), 
+                        ' ') 
+                        FROM kb_lineitems l 
+                        LEFT JOIN kb_items i ON l.item_id = i.item_id 
+                        WHERE l.lineitem_txn_id = t.txn_id
+                    ) ldata 
+                FROM kb_transactions t 
+                LEFT JOIN kb_names n ON t.txn_name_id = n.name_id 
+                LEFT JOIN kb_names c ON t.txn_category_id = c.name_id 
+                LEFT JOIN kb_prefix p ON t.txn_prefix_id = p.prefix_id
             ) t1 
-            LEFT JOIN (
-                SELECT 
-                    li.lineitem_id, 
-                    li.lineitem_txn_id, 
-                    (COALESCE(i.item_name, '') || ' ' || 
-                    COALESCE(i.item_code,'') || ' ' || 
-                    COALESCE(i.item_hsn_sac_code,'')|| ' ' || 
-                    COALESCE(li.lineitem_batch_number,'')|| ' ' || 
-                    COALESCE(li.lineitem_serial_number,'')|| ' ' || 
-                    COALESCE(li.lineitem_count,'')|| ' ' || 
-                    COALESCE(li.lineitem_description,'') || ' ' || 
-                    COALESCE(li.sn,'') 
-                ) ldata 
-                FROM (
-                    SELECT 
-                        l.lineitem_txn_id, 
-                        l.lineitem_id, 
-                        l.item_id, 
-                        l.lineitem_batch_number, 
-                        l.lineitem_serial_number, 
-                        l.lineitem_count, 
-                        l.lineitem_description, 
-                        group_concat(sd.serial_number , ' ') sn 
-                    FROM kb_lineitems l 
-                    LEFT JOIN kb_serial_mapping sm ON l.lineitem_id = sm.serial_mapping_lineitem_id 
-                    LEFT JOIN kb_serial_details sd ON sm.serial_mapping_serial_id = sd.serial_id 
-                    GROUP BY l.lineitem_id
-                ) li 
-                LEFT JOIN kb_items i ON li.item_id = i.item_id
-            ) l1 ON t1.txn_id = l1.lineitem_txn_id 
-            GROUP BY t1.txn_id;
+            ORDER BY t1.txn_id;
             """)
 
+            # The helper indexes are not part of the app's schema
+            for index_name, _, _ in FTS_JOIN_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name};")
+
             conn.commit()
             
             # Verify only the expected tables were created
@@ -2010,20 +2816,22 @@ Note: This process may take several minutes for large databases.
                 for table in unexpected_tables:
                     cursor.execute(f"DROP TABLE IF EXISTS {table};")
                 conn.commit()
-                self.status_text.insert(tk.END, f"✓ Removed unexpected FTS tables: {', '.join(unexpected_tables)}\n", 'success')
+                self._post_status(f"✓ Removed unexpected FTS tables: {', '.join(unexpected_tables)}\n", 'success')
             
             # Verify FTS table was created
             cursor.execute("SELECT count(*) FROM kb_fts_vtable")
             count = cursor.fetchone()[0]
-            self.status_text.insert(tk.END, f"✓ FTS table created with {count} records\n", 'success')
-            self.status_text.insert(tk.END, f"✓ Created tables: {', '.join(expected_tables & set(fts_tables))}\n", 'success')
+            self._post_status(f"✓ FTS table created with {count} records\n", 'success')
+            self._post_status(f"✓ Created tables: {', '.join(expected_tables & set(fts_tables))}\n", 'success')
             
         except sqlite3.Error as e:
-            conn.rollback()
-            self.status_text.insert(tk.END, f"✗ Error creating FTS table: {str(e)}\n", 'error')
+            if conn:
+                conn.rollback()
+            self._post_status(f"✗ Error creating FTS table: {str(e)}\n", 'error')
             raise e
         finally:
-            conn.close()
+            if conn:
+                conn.close()
 
     def process_file_with_fts(self, input_file):
         temp_dir = "temp_fts"
@@ -2038,47 +2846,33 @@ Note: This process may take several minutes for large databases.
 
             # If input is .vyb, unzip it to get .vyp
             if input_file.endswith(".vyb"):
-                self.progress_bar["value"] = 20
-                self.update()
-                self.unzip_vyb(input_file, temp_dir)
-                # Find the extracted .vyp file in the temp directory
-                extracted_files = os.listdir(temp_dir)
-                vyp_file = None
-                for file in extracted_files:
-                    if file.endswith(".vyp"):
-                        vyp_file = os.path.join(temp_dir, file)
-                        break
-                if not vyp_file:
-                    raise ValueError("No .vyp file found in the extracted .vyb archive.")
+                self._post_progress(20)
+                vyp_file = self.unzip_vyb(input_file, temp_dir)
             else:
                 # If input is .vyp, use it directly
                 vyp_file = input_file
 
-            self.progress_bar["value"] = 40
-            self.update()
+            self._post_progress(40)
 
             # Create the FTS table
             self.create_fts_table(vyp_file, output_vyp)
 
-            self.progress_bar["value"] = 60
-            self.update()
+            self._post_progress(60)
 
             # Always generate both .vyp and .vyb files
             # Zip the .vyp file into .vyb
             self.zip_vyp(output_vyp, output_vyb)
 
-            self.progress_bar["value"] = 100
-            self.update()
-            self.status_text.insert(tk.END, f"✓ Output .vyp file with FTS table generated: {output_vyp}\n", 'success')
-            self.status_text.insert(tk.END, f"✓ Output .vyb file with FTS table generated: {output_vyb}\n", 'success')
+            self._post_progress(100)
+            self._post_status(f"✓ Output .vyp file with FTS table generated: {output_vyp}\n", 'success')
+            self._post_status(f"✓ Output .vyb file with FTS table generated: {output_vyb}\n", 'success')
 
             # Enable download buttons if the output files exist
             if os.path.exists(output_vyp) and os.path.exists(output_vyb):
-                self.download_vyb_button.config(state=NORMAL)
-                self.download_vyp_button.config(state=NORMAL)
+                self.after(0, self._enable_downloads)
         except Exception as e:
-            self.status_text.insert(tk.END, f"✗ Error: {str(e)}\n", 'error')
-            self.progress_bar["value"] = 0
+            self._post_status(f"✗ Error: {str(e)}\n", 'error')
+            self._post_progress(0)
 
     def browse_input_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("VYB & VYP Files", "*.vyb *.vyp")])
@@ -2103,9 +2897,8 @@ Note: This process may take several minutes for large databases.
 
         # Look for FTS .vyp files
         input_filename = os.path.basename(input_file)
-        possible_files = [f for f in os.listdir("temp_fts") 
-                         if f.startswith(f"FTS_{os.path.splitext(input_filename)[0]}") 
-                         and f.endswith(".vyp")]
+        possible_files = _find_artifacts(
+            "temp_fts", (f"FTS_{os.path.splitext(input_filename)[0]}",), ".vyp")
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No FTS .vyp output files found\n", 'error')
@@ -2119,7 +2912,7 @@ Note: This process may take several minutes for large databases.
             initialfile=possible_files[0]
         )
         if file_path:
-            shutil.copy(output_vyp, file_path)
+            _fast_copy(output_vyp, file_path)
             self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
 
     def download_vyb(self):
@@ -2130,9 +2923,8 @@ Note: This process may take several minutes for large databases.
 
         # Look for FTS .vyb files
         input_filename = os.path.basename(input_file)
-        possible_files = [f for f in os.listdir("temp_fts") 
-                         if f.startswith(f"FTS_{os.path.splitext(input_filename)[0]}") 
-                         and f.endswith(".vyb")]
+        possible_files = _find_artifacts(
+            "temp_fts", (f"FTS_{os.path.splitext(input_filename)[0]}",), ".vyb")
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No FTS .vyb output files found\n", 'error')
@@ -2146,7 +2938,7 @@ Note: This process may take several minutes for large databases.
             initialfile=possible_files[0]
         )
         if file_path:
-            shutil.copy(output_vyb, file_path)
+            _fast_copy(output_vyb, file_path)
             self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
 
     def cleanup_temp_dir(self):
@@ -2156,10 +2948,17 @@ Note: This process may take several minutes for large databases.
 
 #--------------Setting Tab -------------------
 # ----------------- Settings Tab -----------------
-class SettingsTab(ttk.Frame):
+class SettingsTab(WorkerStatusMixin, ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
+        import ttkbootstrap as ttkb
         self.style = ttkb.Style()
+        self._init_status_buffer()
+        # .vyb outputs not written yet: archive name -> .vyp to pack on download
+        self._pending_vyb_sources = {}
+        # Scratch directory holding the latest repair's outputs
+        self._temp_dir = None
+        _remove_stale_scratch_dirs()
         self.create_widgets()
         self.setup_theme_colors()
         
@@ -2168,18 +2967,10 @@ class SettingsTab(ttk.Frame):
     
     def setup_theme_colors(self):
         """Set color tags based on current theme"""
-        if self.style.theme_use() == "cyborg":
-            # Dark theme colors
-            self.status_text.tag_config('error', foreground='#FF6B6B')
-            self.status_text.tag_config('success', foreground='#7CFC00')
-            self.status_text.tag_config('warning', foreground='#FFA040')
-            self.status_text.configure(bg='#222222', fg='#FFFFFF')
-        else:
-            # Light theme colors
-            self.status_text.tag_config('error', foreground='red')
-            self.status_text.tag_config('success', foreground='green')
-            self.status_text.tag_config('warning', foreground='orange')
-            self.status_text.configure(bg='#FFFFFF', fg='#000000')
+        colors = STATUS_THEME_COLORS.get(self.style.theme_use(), STATUS_THEME_COLORS["pulse"])
+        for tag, foreground in colors["tags"].items():
+            self.status_text.tag_config(tag, foreground=foreground)
+        self.status_text.configure(bg=colors["bg"], fg=colors["fg"])
     
     def create_widgets(self):
         # Main frame
@@ -2282,9 +3073,6 @@ Key Features:
         )
         self.status_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Configure text tags for styling
-        self.setup_theme_colors()
-        
         # Download buttons
         download_frame = ttk.Frame(main_frame)
         download_frame.pack(pady=10, padx=20)
@@ -2292,7 +3080,7 @@ Key Features:
         self.download_vyb_button = ttk.Button(
             download_frame, 
             text="⬇️ Download .vyb", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyb, 
             bootstyle="primary",
             width=20
@@ -2302,7 +3090,7 @@ Key Features:
         self.download_vyp_button = ttk.Button(
             download_frame, 
             text="⬇️ Download .vyp", 
-            state=DISABLED, 
+            state=tk.DISABLED, 
             command=self.download_vyp, 
             bootstyle="primary",
             width=20
@@ -2310,36 +3098,46 @@ Key Features:
         self.download_vyp_button.pack(side=tk.LEFT, padx=5)
     
     def unzip_vyb(self, vyb_file, extract_to):
-        with zipfile.ZipFile(vyb_file, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        return unpack_vyp_from_vyb(vyb_file, extract_to)
 
     def zip_vyp(self, vyp_file, vyb_file):
-        with zipfile.ZipFile(vyb_file, 'w') as zip_ref:
-            zip_ref.write(vyp_file, os.path.basename(vyp_file))
+        # Repaired .vyb files have always been stored, not deflated
+        _pack_vyp_stored(vyp_file, vyb_file)
 
     def thread_safe_status(self, msg, tag=None):
-        self.after(0, lambda: self.status_text.insert('end', msg + '\n', tag))
+        self._post_status(msg + '\n', tag)
 
     def thread_safe_progress(self, value):
-        self.after(0, lambda: self.progress_bar.config(value=value))
+        self._post_progress(value)
 
+    def _enable_downloads(self):
+        self.download_vyb_button.config(state=tk.NORMAL)
+        self.download_vyp_button.config(state=tk.NORMAL)
+
+    # repair_settings_table and process_file run on a worker thread: they only
+    # touch widgets through thread_safe_status/thread_safe_progress/after
     def repair_settings_table(self, input_db, output_db):
         conn = None
         try:
             self.thread_safe_progress(10)
             self.thread_safe_status("Opening database...")
             # Copy the input database to the output database
-            shutil.copy(input_db, output_db)
+            _fast_copy(input_db, output_db)
 
-            # Connect to the output database
-            conn = sqlite3.connect(output_db)
+            # Connect to the output database; transactions are opened and closed
+            # explicitly below rather than by the sqlite3 module
+            conn = sqlite3.connect(output_db, isolation_level=None)
             cursor = conn.cursor()
 
+            # The output is a scratch copy until it is downloaded, so skip
+            # fsyncs and keep the rollback journal off disk
+            cursor.executescript(SANITIZE_PRAGMAS)
+
             # Enable foreign key checks
             cursor.execute("PRAGMA foreign_keys = ON;")
 
             # Step 1: Check if kb_settings table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='kb_settings'")
+            cursor.execute(SETTINGS_TABLE_EXISTS_SQL)
             if not cursor.fetchone():
                 raise ValueError("kb_settings table does not exist in the database")
 
@@ -2350,119 +3148,107 @@ Key Features:
             if 'setting_id' not in columns or 'setting_key' not in columns or 'setting_value' not in columns:
                 raise ValueError("kb_settings table doesn't have the expected columns (setting_id, setting_key, setting_value)")
 
+            # A table already laid out as SETTINGS_TABLE_DDL whose rows hold no
+            # duplicates only needs its index rebuilt: do that and report without
+            # pulling the rows into Python. Duplicates let in by a damaged index
+            # go through the full repair below.
+            if _settings_table_is_canonical(cursor):
+                record_count, duplicate_ids, duplicate_keys = cursor.execute(
+                    SETTINGS_DUPLICATE_STATS_SQL).fetchone()
+                if not record_count:
+                    self.thread_safe_status("✓ kb_settings table is empty - no repair needed")
+                    return
+                if not duplicate_ids and not duplicate_keys:
+                    cursor.execute("REINDEX kb_settings")
+                    self.thread_safe_status("✓ No duplicates detected - no repair needed", 'success')
+                    self.thread_safe_status(f"✓ Original records: {record_count}")
+                    return
+
             # Step 3: Export all data from kb_settings table
-            cursor.execute("SELECT setting_id, setting_key, setting_value FROM kb_settings")
+            cursor.execute(SETTINGS_EXPORT_SQL)
             settings_data = cursor.fetchall()
             
             if not settings_data:
-                self.status_text.insert(tk.END, "✓ kb_settings table is empty - no repair needed\n")
+                self.thread_safe_status("✓ kb_settings table is empty - no repair needed")
                 return
 
-            # Step 4: Find and log duplicate setting_ids and setting_keys
-            setting_ids = {}
-            setting_keys = {}
-            duplicates = {'id': [], 'key': []}
-            
-            for row in settings_data:
-                setting_id, setting_key, _ = row
-                if setting_id in setting_ids:
-                    duplicates['id'].append(setting_id)
-                else:
-                    setting_ids[setting_id] = True
-                    
-                if setting_key in setting_keys:
-                    duplicates['key'].append(setting_key)
-                else:
-                    setting_keys[setting_key] = True
+            # Step 4: Find and log duplicate setting_ids and setting_keys, resolving
+            # the rows to reinsert in the same pass
+            rows, duplicates, updated_count, skipped_count = _dedupe_settings_rows(settings_data)
             
             if duplicates['id']:
-                self.status_text.insert(tk.END, f"⚠ Found {len(duplicates['id'])} duplicate setting_ids\n", 'warning')
+                self.thread_safe_status(f"⚠ Found {duplicates['id']} duplicate setting_ids", 'warning')
             if duplicates['key']:
-                self.status_text.insert(tk.END, f"⚠ Found {len(duplicates['key'])} duplicate setting_keys\n", 'warning')
+                self.thread_safe_status(f"⚠ Found {duplicates['key']} duplicate setting_keys", 'warning')
+
+            # Steps 5-7 run in one transaction: one commit for the whole rebuild,
+            # and a failure part-way leaves the original table in place
+            cursor.execute("BEGIN IMMEDIATE;")
 
             # Step 5: Drop the kb_settings table
             cursor.execute("DROP TABLE IF EXISTS kb_settings")
             
             # Step 6: Recreate the kb_settings table with proper schema and constraints
-            cursor.execute("""
-            CREATE TABLE kb_settings (
-                setting_id INTEGER PRIMARY KEY,
-                setting_key TEXT UNIQUE,
-                setting_value TEXT
-            )""")
-
-            # Step 7: Insert the exported data back, handling duplicates
-            inserted_count = 0
-            updated_count = 0
-            skipped_count = 0
-            
-            for row in settings_data:
-                setting_id, setting_key, setting_value = row
-                
-                # First try to insert with original setting_id
-                try:
-                    cursor.execute("""
-                    INSERT INTO kb_settings (setting_id, setting_key, setting_value)
-                    VALUES (?, ?, ?)
-                    """, (setting_id, setting_key, setting_value))
-                    inserted_count += 1
-                except sqlite3.IntegrityError as e:
-                    # If duplicate setting_id, let SQLite auto-generate a new one
-                    if "setting_id" in str(e):
-                        try:
-                            cursor.execute("""
-                            INSERT INTO kb_settings (setting_key, setting_value)
-                            VALUES (?, ?)
-                            """, (setting_key, setting_value))
-                            inserted_count += 1
-                        except sqlite3.IntegrityError:
-                            # If duplicate key, update the existing record
-                            cursor.execute("""
-                            UPDATE kb_settings 
-                            SET setting_value = ?
-                            WHERE setting_key = ?
-                            """, (setting_value, setting_key))
-                            updated_count += 1
-                    # If duplicate setting_key, update the existing record
-                    elif "setting_key" in str(e):
-                        cursor.execute("""
-                        UPDATE kb_settings 
-                        SET setting_value = ?
-                        WHERE setting_key = ?
-                        """, (setting_value, setting_key))
-                        updated_count += 1
-                    else:
-                        skipped_count += 1
+            cursor.execute(SETTINGS_TABLE_DDL)
+
+            # Step 7: Insert the resolved rows back, as many per INSERT statement
+            # as the parameter limit allows
+            for start in range(0, len(rows), SETTINGS_INSERT_ROWS):
+                batch = rows[start:start + SETTINGS_INSERT_ROWS]
+                if len(batch) == SETTINGS_INSERT_ROWS:
+                    sql = SETTINGS_INSERT_BATCH_SQL
+                else:
+                    sql = SETTINGS_INSERT_SQL.format(", ".join(["(?, ?, ?)"] * len(batch)))
+                cursor.execute(sql, list(chain.from_iterable(batch)))
+            inserted_count = len(rows)
 
-            conn.commit()
+            cursor.execute("COMMIT;")
             
             # Verify the repair
             cursor.execute("SELECT COUNT(*) FROM kb_settings")
             final_count = cursor.fetchone()[0]
             
-            self.status_text.insert(tk.END, f"✓ kb_settings table repaired successfully\n", 'success')
-            self.status_text.insert(tk.END, f"✓ Original records: {len(settings_data)}\n")
-            self.status_text.insert(tk.END, f"✓ Final records: {final_count}\n")
-            self.status_text.insert(tk.END, f"✓ Records inserted: {inserted_count}\n")
-            self.status_text.insert(tk.END, f"✓ Records updated: {updated_count}\n")
+            self.thread_safe_status(f"✓ kb_settings table repaired successfully", 'success')
+            self.thread_safe_status(f"✓ Original records: {len(settings_data)}")
+            self.thread_safe_status(f"✓ Final records: {final_count}")
+            self.thread_safe_status(f"✓ Records inserted: {inserted_count}")
+            self.thread_safe_status(f"✓ Records updated: {updated_count}")
             if skipped_count > 0:
-                self.status_text.insert(tk.END, f"⚠ Records skipped: {skipped_count}\n", 'warning')
+                self.thread_safe_status(f"⚠ Records skipped: {skipped_count}", 'warning')
             
         except sqlite3.Error as e:
-            conn.rollback()
-            self.status_text.insert(tk.END, f"✗ Error repairing kb_settings table: {str(e)}\n", 'error')
+            if conn and conn.in_transaction:
+                conn.execute("ROLLBACK;")
+            self.thread_safe_status(f"✗ Error repairing kb_settings table: {str(e)}", 'error')
             raise e
         except ValueError as e:
-            self.status_text.insert(tk.END, f"✗ {str(e)}\n", 'error')
+            self.thread_safe_status(f"✗ {str(e)}", 'error')
             raise e
         finally:
-            conn.close()
+            if conn:
+                conn.close()
 
-    def process_file(self, input_file):
-        temp_dir = "temp_settings"
-        os.makedirs(temp_dir, exist_ok=True)
+    def _new_scratch_dir(self, input_file):
+        """A fresh scratch directory for repairing input_file, in RAM when there is room.
+
+        The previous repair's directory and outputs are removed first.
+        """
+        self.cleanup_temp_dir()
+        self._pending_vyb_sources.clear()
+        # A .vyb is extracted before the repaired copy is written
+        if input_file.endswith(".vyb"):
+            with zipfile.ZipFile(input_file) as zf:
+                needed = 2 * sum(info.file_size for info in zf.infolist())
+        else:
+            needed = os.path.getsize(input_file)
+        self._temp_dir = tempfile.mkdtemp(prefix=f"{SETTINGS_SCRATCH_PREFIX}{os.getpid()}_",
+                                          dir=_scratch_parent(needed))
+        return self._temp_dir
 
+    def process_file(self, input_file):
         try:
+            temp_dir = self._new_scratch_dir(input_file)
+
             # Generate output file name
             input_filename = os.path.basename(input_file)
             output_filename = f"REPAIRED_{input_filename}"
@@ -2471,47 +3257,35 @@ Key Features:
 
             # If input is .vyb, unzip it to get .vyp
             if input_file.endswith(".vyb"):
-                self.progress_bar["value"] = 20
-                self.update()
-                self.unzip_vyb(input_file, temp_dir)
-                # Find the extracted .vyp file in the temp directory
-                extracted_files = os.listdir(temp_dir)
-                vyp_file = None
-                for file in extracted_files:
-                    if file.endswith(".vyp"):
-                        vyp_file = os.path.join(temp_dir, file)
-                        break
-                if not vyp_file:
-                    raise ValueError("No .vyp file found in the extracted .vyb archive.")
+                self.thread_safe_progress(20)
+                vyp_file = self.unzip_vyb(input_file, temp_dir)
             else:
                 # If input is .vyp, use it directly
                 vyp_file = input_file
 
-            self.progress_bar["value"] = 40
-            self.update()
+            self.thread_safe_progress(40)
 
             # Repair the settings table
             self.repair_settings_table(vyp_file, output_vyp)
+            if vyp_file != input_file:
+                # The extracted copy was only the repair's input; free its scratch space
+                os.remove(vyp_file)
 
-            self.progress_bar["value"] = 60
-            self.update()
+            self.thread_safe_progress(60)
 
-            # Always generate both .vyp and .vyb files
-            # Zip the .vyp file into .vyb
-            self.zip_vyp(output_vyp, output_vyb)
+            # The .vyb is only written if the user downloads it
+            self._pending_vyb_sources[os.path.basename(output_vyb)] = output_vyp
 
-            self.progress_bar["value"] = 100
-            self.update()
-            self.status_text.insert(tk.END, f"✓ Output .vyp file with repaired settings table: {output_vyp}\n", 'success')
-            self.status_text.insert(tk.END, f"✓ Output .vyb file with repaired settings table: {output_vyb}\n", 'success')
+            self.thread_safe_progress(100)
+            self.thread_safe_status(f"✓ Output .vyp file with repaired settings table: {output_vyp}", 'success')
+            self.thread_safe_status(f"✓ Output .vyb file ready (packed on download): {output_vyb}", 'success')
 
-            # Enable download buttons if the output files exist
-            if os.path.exists(output_vyp) and os.path.exists(output_vyb):
-                self.download_vyb_button.config(state=NORMAL)
-                self.download_vyp_button.config(state=NORMAL)
+            # Enable download buttons if the output file exists
+            if os.path.exists(output_vyp):
+                self.after(0, self._enable_downloads)
         except Exception as e:
-            self.status_text.insert(tk.END, f"✗ Error: {str(e)}\n", 'error')
-            self.progress_bar["value"] = 0
+            self.thread_safe_status(f"✗ Error: {str(e)}", 'error')
+            self.thread_safe_progress(0)
 
     def browse_input_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("VYB & VYP Files", "*.vyb *.vyp")])
@@ -2536,15 +3310,14 @@ Key Features:
 
         # Look for repaired .vyp files
         input_filename = os.path.basename(input_file)
-        possible_files = [f for f in os.listdir("temp_settings") 
-                         if f.startswith(f"REPAIRED_{os.path.splitext(input_filename)[0]}") 
-                         and f.endswith(".vyp")]
+        prefix = f"REPAIRED_{os.path.splitext(input_filename)[0]}"
+        possible_files = _find_artifacts(self._temp_dir, (prefix,), ".vyp") if self._temp_dir else []
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No repaired .vyp output files found\n", 'error')
             return
         
-        output_vyp = os.path.join("temp_settings", possible_files[0])
+        output_vyp = os.path.join(self._temp_dir, possible_files[0])
         
         file_path = filedialog.asksaveasfilename(
             defaultextension=".vyp", 
@@ -2552,7 +3325,7 @@ Key Features:
             initialfile=possible_files[0]
         )
         if file_path:
-            shutil.copy(output_vyp, file_path)
+            _fast_copy(output_vyp, file_path)
             self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
 
     def download_vyb(self):
@@ -2563,15 +3336,18 @@ Key Features:
 
         # Look for repaired .vyb files
         input_filename = os.path.basename(input_file)
-        possible_files = [f for f in os.listdir("temp_settings") 
-                         if f.startswith(f"REPAIRED_{os.path.splitext(input_filename)[0]}") 
-                         and f.endswith(".vyb")]
+        prefix = f"REPAIRED_{os.path.splitext(input_filename)[0]}"
+        possible_files = _find_artifacts(self._temp_dir, (prefix,), ".vyb") if self._temp_dir else []
+        # Outputs whose .vyb has not been packed yet
+        possible_files += sorted(
+            name for name, src in self._pending_vyb_sources.items()
+            if name.startswith(prefix) and name not in possible_files and os.path.exists(src))
         
         if not possible_files:
             self.status_text.insert(tk.END, f"✗ Error: No repaired .vyb output files found\n", 'error')
             return
         
-        output_vyb = os.path.join("temp_settings", possible_files[0])
+        output_vyb = os.path.join(self._temp_dir, possible_files[0])
         
         file_path = filedialog.asksaveasfilename(
             defaultextension=".vyb", 
@@ -2579,12 +3355,30 @@ Key Features:
             initialfile=possible_files[0]
         )
         if file_path:
-            shutil.copy(output_vyb, file_path)
-            self.status_text.insert(tk.END, f"✓ File saved successfully: {file_path}\n", 'success')
+            # Packing reads and checksums the whole database: keep it off the Tk thread
+            self.download_vyb_button.config(state=tk.DISABLED)
+            Thread(target=self.save_vyb, args=(possible_files[0], output_vyb, file_path), daemon=True).start()
+
+    def save_vyb(self, selected_file, output_vyb, file_path):
+        # Runs on a worker thread; reports through thread_safe_status/thread_safe_progress
+        try:
+            self.thread_safe_progress(0)
+            if selected_file in self._pending_vyb_sources:
+                # Pack the repaired .vyp straight into the chosen location
+                self.zip_vyp(self._pending_vyb_sources[selected_file], file_path)
+            else:
+                _fast_copy(output_vyb, file_path)
+            self.thread_safe_progress(100)
+            self.thread_safe_status(f"✓ File saved successfully: {file_path}", 'success')
+        except Exception as e:
+            self.thread_safe_status(f"✗ Error saving {file_path}: {str(e)}", 'error')
+        finally:
+            self.after(0, lambda: self.download_vyb_button.config(state=tk.NORMAL))
 
     def cleanup_temp_dir(self):
-        if os.path.exists("temp_settings"):
-            shutil.rmtree("temp_settings", ignore_errors=True)
+        if self._temp_dir and os.path.exists(self._temp_dir):
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+        self._temp_dir = None
 
 
 # ----------------- Main Application -----------------
@@ -2597,6 +3391,7 @@ class DatabaseToolApp:
 
         
         # Configure styles
+        import ttkbootstrap as ttkb
         self.style = ttkb.Style(theme="cyborg")
         self.current_theme = "cyborg"
         
@@ -2647,14 +3442,9 @@ class DatabaseToolApp:
         self.comparison_tab.setup_theme_colors()
         self.sanitizer_tab.style.theme_use(self.current_theme)
         self.sanitizer_tab.setup_theme_colors()
-        
-        # Force refresh of the comparison results display
-        if hasattr(self.comparison_tab, 'result_text'):
-            current_content = self.comparison_tab.result_text.get("1.0", tk.END)
-            self.comparison_tab.result_text.delete("1.0", tk.END)
-            self.comparison_tab.result_text.insert(tk.END, current_content)
 
 def main():
+    import ttkbootstrap as ttkb
     root = ttkb.Window(themename="cyborg")
     app = DatabaseToolApp(root)
     root.mainloop()
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+
+class _StatusLog:
+    """Stands in for SettingsTab: repair_settings_table only reports through these."""
+
+    def __init__(self):
+        self.messages = []
+
+    def thread_safe_status(self, msg, tag=None):
+        self.messages.append(msg)
+
+    def thread_safe_progress(self, value):
+        pass
+
+
+def _write_drifted_settings(path):
+    """kb_settings in the repaired layout whose unique index no longer matches its rows.
+
+    The rows (1, 'a', '1') and (2, 'a', '2') are swapped in under the index built
+    for keys 'a' and 'b', so the table holds a duplicate key the index never saw.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(db.SETTINGS_TABLE_DDL)
+    conn.execute("INSERT INTO kb_settings VALUES (1, 'a', '1'), (2, 'b', '2')")
+    conn.execute("CREATE TABLE shadow (setting_id INTEGER PRIMARY KEY, setting_key TEXT, setting_value TEXT)")
+    conn.execute("INSERT INTO shadow VALUES (1, 'a', '1'), (2, 'a', '2')")
+    conn.commit()
+    roots = dict(conn.execute("SELECT name, rootpage FROM sqlite_master WHERE type = 'table'"))
+    conn.execute("PRAGMA writable_schema = ON")
+    conn.execute("UPDATE sqlite_master SET rootpage = ? WHERE name = 'kb_settings'", (roots['shadow'],))
+    conn.execute("UPDATE sqlite_master SET rootpage = ? WHERE name = 'shadow'", (roots['kb_settings'],))
+    conn.commit()
+    conn.close()
+
+
+class RepairSettingsTableTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_db = os.path.join(self.temp_dir.name, "in.vyp")
+        self.output_db = os.path.join(self.temp_dir.name, "REPAIRED_in.vyp")
+        self.log = _StatusLog()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def repair(self):
+        db.SettingsTab.repair_settings_table(self.log, self.input_db, self.output_db)
+        conn = sqlite3.connect(self.output_db)
+        try:
+            rows = conn.execute("SELECT setting_id, setting_key, setting_value FROM kb_settings").fetchall()
+            integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+        return rows, integrity
+
+    def test_drifted_unique_index_is_rebuilt(self):
+        _write_drifted_settings(self.input_db)
+
+        rows, integrity = self.repair()
+
+        self.assertEqual(rows, [(1, 'a', '2')])
+        self.assertEqual(integrity, "ok")
+        self.assertIn("✓ kb_settings table repaired successfully", self.log.messages)
+        self.assertNotIn("✓ No duplicates detected - no repair needed", self.log.messages)
+
+    def test_clean_repaired_layout_is_left_in_place(self):
+        conn = sqlite3.connect(self.input_db)
+        conn.execute(db.SETTINGS_TABLE_DDL)
+        conn.execute("INSERT INTO kb_settings VALUES (1, 'a', '1'), (2, 'b', '2')")
+        conn.commit()
+        conn.close()
+
+        rows, integrity = self.repair()
+
+        self.assertEqual(rows, [(1, 'a', '1'), (2, 'b', '2')])
+        self.assertEqual(integrity, "ok")
+        self.assertIn("✓ No duplicates detected - no repair needed", self.log.messages)
+
+
+if __name__ == "__main__":
+    unittest.main()